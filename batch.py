@@ -0,0 +1,268 @@
+import argparse
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from cache import DEFAULT_MAX_SIZE, RecordCache
+from parse import build_record_from_document
+from serialize import dumps_binary, loads_binary
+
+DOCUMENT_EXTENSION = '.docx'
+
+
+def find_documents(folder, recursive=False):
+    """Finds all of the word documents in a folder
+
+    Args:
+        folder(str): The path of the folder to search
+        recursive(bool): Whether to also search the folder's subfolders (optional)
+
+    Returns:
+        list(str): The sorted list of word document paths
+
+    """
+    paths = []
+    for root, dirs, files in os.walk(folder):
+        for file in files:
+            # Skip the lock files word leaves behind while a document is open
+            if file.lower().endswith(DOCUMENT_EXTENSION) and not file.startswith('~$'):
+                paths.append(os.path.join(root, file))
+
+        if not recursive:
+            break
+
+    return sorted(paths)
+
+
+def parse_document(path, cache=None, instrumented=False, traced=False):
+    """Builds a Record object from a document without letting any error escape
+
+    Args:
+        path(str): The path to a word document
+        cache(RecordCache): A cache to reuse the Record objects of documents parsed before in
+            (optional)
+        instrumented(bool): Whether to record metrics of the extractors while parsing (optional)
+        traced(bool): Whether to record trace spans of the parsing stages (optional)
+
+    Returns:
+        (str, bytes, str, dict, list): A 5-tuple containing the path, the built Record object
+            serialized by dumps_binary (or None), an error message (or None), a snapshot of the
+            metrics recorded while parsing (or None) and the trace events recorded while parsing
+            (or None)
+
+    """
+    if instrumented:
+        import metrics
+
+        metrics.enable(exporters=False)
+
+    if traced:
+        import tracing
+
+        tracing.enable(exporters=False)
+
+    try:
+        if cache is not None:
+            result = path, dumps_binary(cache.build_record(path)), None
+        else:
+            result = path, dumps_binary(build_record_from_document(path)), None
+    except Exception as e:
+        result = path, None, f'{type(e).__name__}: {e}'
+
+    return (
+        *result,
+        metrics.metrics.take() if instrumented else None,
+        tracing.tracer.take() if traced else None
+    )
+
+
+def batch_parse(paths, workers=None, cache=None, metrics=None, tracer=None):
+    """Builds Record objects from many documents on a process pool
+
+    Args:
+        paths(list(str)): The paths of the word documents to parse
+        workers(int): The number of worker processes, or None to use one per CPU (optional)
+        cache(RecordCache): A cache shared by the worker processes (optional)
+        metrics(metrics.Metrics): Metrics to add the metrics of the extractors in the worker processes
+            to, or None to not record any (optional)
+        tracer(tracing.Tracer): A tracer to add the trace events of the worker processes to, or None
+            to not record any (optional)
+
+    Yields:
+        (str, Record, str): A 3-tuple for each document in the order they finish, containing
+            the path, the built Record object (or None) and an error message (or None)
+
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(parse_document, path, cache, metrics is not None, tracer is not None): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            try:
+                path, data, error, snapshot, events = future.result()
+                if snapshot is not None:
+                    metrics.merge(snapshot)
+
+                if events is not None:
+                    tracer.merge(events)
+
+                yield path, None if data is None else loads_binary(data), error
+            except Exception as e:
+                # The worker process itself died, so the error couldn't be caught inside it
+                yield futures[future], None, f'{type(e).__name__}: {e}'
+
+
+def main(argv=None):
+    """Parses every document in a folder and prints a summary
+
+    Args:
+        argv(list(str)): The command line arguments (optional)
+
+    Returns:
+        int: The exit code, which is non-zero if any document failed to parse or export
+
+    """
+    parser = argparse.ArgumentParser(description='Parse a folder of NDIS plans in parallel.')
+    parser.add_argument('folder', help='the folder containing the word documents to parse')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='the number of worker processes (default: one per CPU)')
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help='also parse documents in subfolders')
+    parser.add_argument('-o', '--output-folder', default='',
+                        help='a folder to export the parsed data of each document to')
+    parser.add_argument('-x', '--export-documents', action='store_true',
+                        help='export the word and excel output documents too, not just the parsed data')
+    parser.add_argument('--export-workers', type=int, default=None,
+                        help='the number of export workers (default: one per CPU)')
+    parser.add_argument('--export-processes', action='store_true',
+                        help='export on worker processes instead of threads')
+    parser.add_argument('--raw-xml', action='store_true',
+                        help='render the word documents without python-docx, which is faster')
+    parser.add_argument('-m', '--metrics', default='',
+                        help='a file to write the metrics of the extractors and exporters to, '
+                             'in the Prometheus text format if it ends in .prom or as JSON otherwise')
+    parser.add_argument('-s', '--store', default='',
+                        help='a database file to add the parsed documents to, so they can be looked up later')
+    parser.add_argument('-t', '--trace', default='',
+                        help='a file to write a Chrome trace of the parsing and exporting stages to, '
+                             'which chrome://tracing and Perfetto can open')
+    parser.add_argument('-c', '--cache-folder', default='',
+                        help='a folder to cache parsed documents in, so unchanged ones are skipped')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_SIZE // (1024 * 1024),
+                        help='the size limit of the cache in megabytes (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    paths = find_documents(args.folder, args.recursive)
+    if not paths:
+        print(f'No word documents found in {args.folder}')
+        return 0
+
+    recorded_metrics = None
+    if args.metrics:
+        import metrics
+
+        # Exports run in this process, so instrument them here, and merge in the worker's metrics
+        metrics.enable(exporters=bool(args.output_folder))
+        recorded_metrics = metrics.metrics
+
+    tracer = None
+    if args.trace:
+        import tracing
+
+        tracing.enable(exporters=bool(args.output_folder))
+        tracer = tracing.tracer
+
+    scheduler = None
+    if args.output_folder:
+        os.makedirs(args.output_folder, exist_ok=True)
+        if args.export_documents:
+            from scheduler import ExportScheduler
+            scheduler = ExportScheduler(
+                os.path.abspath(args.output_folder),
+                args.export_workers,
+                args.export_processes,
+                raw_xml=args.raw_xml,
+                traced=tracer is not None,
+                instrumented=recorded_metrics is not None
+            )
+        else:
+            from export import record_export
+
+    cache = None
+    if args.cache_folder:
+        cache = RecordCache(args.cache_folder, args.cache_size * 1024 * 1024)
+
+    store = None
+    stored = []
+    if args.store:
+        from store import DEFAULT_BATCH_SIZE, RecordStore
+        store = RecordStore(args.store)
+
+    failures = []
+    export_failures = []
+    start = time.perf_counter()
+    try:
+        results = batch_parse(paths, args.workers, cache, recorded_metrics, tracer)
+        for i, (path, record, error) in enumerate(results, 1):
+            if error is None:
+                try:
+                    if scheduler is not None:
+                        scheduler.submit(record)
+                    elif args.output_folder:
+                        record_export(record, args.output_folder)
+                except Exception as e:
+                    error = f'{type(e).__name__}: {e}'
+
+            if error is not None:
+                failures.append((path, error))
+                print(f'[{i}/{len(paths)}] FAILED {path}: {error}', file=sys.stderr)
+                continue
+
+            # Add the Records in batches, each in one transaction
+            if store is not None:
+                stored.append((record, os.path.abspath(path)))
+                if len(stored) >= DEFAULT_BATCH_SIZE:
+                    store.put_many(stored)
+                    stored = []
+
+            print(f'[{i}/{len(paths)}] {path}')
+    finally:
+        # Finish the exports and keep the Records parsed so far, even if the batch was interrupted
+        if scheduler is not None:
+            export_failures = scheduler.close()
+
+        if store is not None:
+            try:
+                store.put_many(stored)
+            finally:
+                store.close()
+
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(f'Documents: {len(paths)}')
+    print(f'Succeeded: {len(paths) - len(failures)}')
+    print(f'Failed: {len(failures)}')
+    print(f'Elapsed: {elapsed:.2f}s')
+    print(f'Throughput: {len(paths) / elapsed:.2f} documents/s')
+    for path, error in failures:
+        print(f'    {path}: {error}')
+
+    if scheduler is not None:
+        print(f'Failed exports: {len(export_failures)}')
+        for description, error in export_failures:
+            print(f'    {description}: {error}')
+
+    if args.metrics:
+        metrics.write_metrics(args.metrics)
+
+    if args.trace:
+        tracing.write_trace(args.trace)
+
+    return 1 if failures or export_failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""Times each extractor in parse.py, building whole Records and each exporter in export.py over a corpus
+of plans, and saves the timings as JSON so runs can be compared
+
+Usage:
+    python benchmarks/bench.py [-c corpus folder] [-o results.json] [--compare earlier.json]
+        [-n documents] [-r repeats]
+
+"""
+import argparse
+import datetime
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import export
+import parse
+
+from corpus import generate_corpus
+
+DEFAULT_DOCUMENTS = 20
+DEFAULT_REPEATS = 5
+RESULTS_VERSION = 1
+
+
+def get_extractors():
+    """Finds the extractors in parse.py
+
+    Returns:
+        list((str, function, tuple)): The name to report, the extractor and the arguments to pass it
+            after the document, for each extractor and, for the supports extractors, each section
+
+    """
+    extractors = []
+    for name, function in inspect.getmembers(parse, inspect.isfunction):
+        if not name.startswith('get_') or name == 'get_document' or function.__module__ != 'parse':
+            continue
+
+        if 'supports_section' in inspect.signature(function).parameters:
+            for supports_type in parse.SUPPORTS_CATEGORIES:
+                extractors.append((f'{name}[{supports_type.name}]', function, (supports_type,)))
+        else:
+            extractors.append((name, function, ()))
+
+    return extractors
+
+
+def time_calls(function, arguments, repeats):
+    """Times a function over every set of arguments, several times over
+
+    Args:
+        function(function): The function to time
+        arguments(list(tuple)): The arguments of each call
+        repeats(int): The number of times to call the function with each set of arguments
+
+    Returns:
+        dict: The number of calls and their minimum, median, mean and 95th percentile times in
+            milliseconds
+
+    """
+    durations = []
+    for _ in range(repeats):
+        for args in arguments:
+            start = time.perf_counter()
+            function(*args)
+            durations.append((time.perf_counter() - start) * 1000)
+
+    durations.sort()
+    return {
+        'calls': len(durations),
+        'min_ms': durations[0],
+        'median_ms': statistics.median(durations),
+        'mean_ms': statistics.mean(durations),
+        'p95_ms': durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+    }
+
+
+def run_benchmarks(paths, repeats):
+    """Times every benchmark over the documents
+
+    Args:
+        paths(list(str)): The paths of the word documents
+        repeats(int): The number of times to run each benchmark on each document
+
+    Returns:
+        dict(str, dict): The timings of each benchmark, by name
+
+    """
+    results = {}
+    documents = [parse.get_document(path) for path in paths]
+
+    results['get_document'] = time_calls(parse.get_document, [(path,) for path in paths], repeats)
+    for name, function, args in get_extractors():
+        results[name] = time_calls(function, [(document, *args) for document in documents], repeats)
+
+    results['build_record_from_text'] = time_calls(
+        parse.build_record_from_text,
+        [(document,) for document in documents],
+        repeats
+    )
+    results['build_record_from_document'] = time_calls(
+        parse.build_record_from_document,
+        [(path,) for path in paths],
+        repeats
+    )
+
+    records = [parse.build_record_from_text(document) for document in documents]
+    with tempfile.TemporaryDirectory() as export_folder:
+        # Load the templates first, so the timings don't include loading them once
+        export.word_export(records[0], export_folder)
+        export.word_export(records[0], export_folder, True)
+        export.excel_export(records[0], export_folder)
+
+        exporters = {
+            'word_export': lambda record: export.word_export(record, export_folder),
+            'word_export[raw_xml]': lambda record: export.word_export(record, export_folder, True),
+            'excel_export': lambda record: export.excel_export(record, export_folder),
+            'record_export': lambda record: export.record_export(record, export_folder)
+        }
+        for name, exporter in exporters.items():
+            results[name] = time_calls(exporter, [(record,) for record in records], repeats)
+
+        results['excel_export_batch'] = time_calls(
+            lambda: export.excel_export_batch(records, export_folder),
+            [()],
+            repeats
+        )
+
+    return results
+
+
+def get_commit():
+    """Gets the git commit the benchmarks ran on
+
+    Returns:
+        str: The commit hash, or None if it isn't known
+
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True
+        ).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, earlier):
+    """Prints how the median timings changed since an earlier run
+
+    Args:
+        results(dict): The results of this run
+        earlier(dict): The results of the earlier run
+
+    Returns:
+        None
+
+    """
+    print(f'{"benchmark":<60} {"before":>10} {"after":>10} {"change":>8}')
+    for name, timings in results['benchmarks'].items():
+        if name not in earlier['benchmarks']:
+            continue
+
+        before = earlier['benchmarks'][name]['median_ms']
+        after = timings['median_ms']
+        change = (after / before - 1) * 100 if before else 0
+        print(f'{name:<60} {before:>8.3f}ms {after:>8.3f}ms {change:>+7.1f}%')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the parser and exporters.')
+    parser.add_argument('-c', '--corpus', default='',
+                        help='a folder of word documents to benchmark with (default: a generated corpus)')
+    parser.add_argument('-n', '--documents', type=int, default=DEFAULT_DOCUMENTS,
+                        help='the number of documents to generate if no corpus is given '
+                             '(default: %(default)s)')
+    parser.add_argument('-r', '--repeats', type=int, default=DEFAULT_REPEATS,
+                        help='the number of times to run each benchmark on each document '
+                             '(default: %(default)s)')
+    parser.add_argument('-o', '--output', default='',
+                        help='a file to save the results to as JSON')
+    parser.add_argument('--compare', default='',
+                        help='the JSON results of an earlier run to compare with')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as corpus_folder:
+        if args.corpus:
+            paths = sorted(
+                os.path.join(args.corpus, filename)
+                for filename in os.listdir(args.corpus)
+                if filename.lower().endswith('.docx')
+            )
+        else:
+            paths = generate_corpus(corpus_folder, args.documents)
+
+        results = {
+            'version': RESULTS_VERSION,
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': get_commit(),
+            'parser_version': parse.PARSER_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'documents': len(paths),
+            'repeats': args.repeats,
+            'benchmarks': run_benchmarks(paths, args.repeats)
+        }
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            compare(results, json.load(file))
+    else:
+        for name, timings in results['benchmarks'].items():
+            print(f'{name:<60} median {timings["median_ms"]:>8.3f}ms  p95 {timings["p95_ms"]:>8.3f}ms')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""Generates a corpus of synthetic NDIS plan word documents laid out the way the parser expects real
+plans to be, with made up participants
+
+Usage:
+    python benchmarks/corpus.py <folder> [-n documents] [--goals goals] [--categories categories]
+        [--pages pages] [--seed seed]
+
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx
+
+from parse import SUPPORTS_CATEGORIES, SupportsType
+
+DEFAULT_DOCUMENTS = 20
+DEFAULT_GOALS = 2
+DEFAULT_CATEGORIES = 2
+DEFAULT_PAGES = 4
+LINES_PER_PAGE = 40
+MONTHS = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+)
+TITLES = ('Mr.', 'Mrs.', 'Ms.', 'Miss')
+FIRST_NAMES = ('Alex', 'Jordan', 'Sam', 'Taylor', 'Casey', 'Morgan', 'Riley', 'Jamie', 'Charlie', 'Drew')
+LAST_NAMES = (
+    'Smith', 'Nguyen', 'Williams', 'Brown', 'Wilson', 'Taylor', 'Martin', 'Anderson', 'Lee', 'Walker'
+)
+STREETS = ('Example Street', 'Station Road', 'High Street', 'Park Avenue', 'Church Lane')
+SUBURBS = (('Springfield', 'NSW', '2000'), ('Riverside', 'VIC', '3000'), ('Hillcrest', 'QLD', '4000'))
+MANAGEMENT_TYPES = ('Plan-managed', 'NDIA-managed', 'Self-managed')
+GOALS = (
+    'To be more independent at home',
+    'To get out into the community more often',
+    'To find and keep a part time job',
+    'To improve my health and fitness',
+    'To build new friendships',
+    'To learn to cook my own meals',
+    'To travel on public transport by myself',
+    'To move into my own home'
+)
+FILLER = (
+    'This plan describes the supports that have been funded to help you pursue your goals.',
+    'You can use your funding flexibly within each support category unless it says otherwise.',
+    'Talk to your support coordinator if your circumstances change before your plan is reviewed.',
+    'Keep your invoices and receipts, as you may be asked for them when your plan is reviewed.',
+    'Your informal supports, such as family and friends, are an important part of your plan.'
+)
+SECTIONS = (
+    ('core', 'Core', SupportsType.CORE, 'Core supports funding is flexible.'),
+    ('capacity building', 'Capacity building', SupportsType.CAPACITY_BUILDING,
+     'Capacity building funding is restricted.'),
+    ('capital', 'Capital', SupportsType.CAPITAL, 'Capital supports funding is specific.')
+)
+
+
+def format_date(day, month, year):
+    """Formats a date the way plans write them
+
+    Args:
+        day(int): The day of the month
+        month(int): The month, from 1 to 12
+        year(int): The year
+
+    Returns:
+        str: The formatted date
+
+    """
+    return f'{day:02} {MONTHS[month - 1]} {year}'
+
+
+def format_amount(cents):
+    """Formats an amount of money the way plans write them
+
+    Args:
+        cents(int): The amount in cents
+
+    Returns:
+        str: The formatted amount
+
+    """
+    return f'${cents // 100:,}.{cents % 100:02}'
+
+
+def generate_filler(rng, lines):
+    """Generates paragraphs of text that the parser has to skip over
+
+    Args:
+        rng(random.Random): The random number generator to use
+        lines(int): The number of paragraphs
+
+    Returns:
+        list(str): The paragraphs
+
+    """
+    return [rng.choice(FILLER) for _ in range(lines)]
+
+
+def generate_plan(i, rng, goals=DEFAULT_GOALS, categories=DEFAULT_CATEGORIES, pages=DEFAULT_PAGES):
+    """Generates the paragraphs of a synthetic plan
+
+    Args:
+        i(int): The index of the plan, which makes its participant's NDIS number unique
+        rng(random.Random): The random number generator to use
+        goals(int): The number of goals in each supports section (optional)
+        categories(int): The most support categories in each supports section, limited by the
+            number of categories the section has (optional)
+        pages(int): The number of pages of filler text spread through the plan (optional)
+
+    Returns:
+        list(str): The paragraphs of the plan
+
+    """
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    suburb, state, postcode = rng.choice(SUBURBS)
+    start_year = rng.randint(2019, 2023)
+    start_month = rng.randint(1, 12)
+    filler_lines = pages * LINES_PER_PAGE // 4
+
+    lines = [
+        'My NDIS Plan',
+        f'Reference:   {rng.randint(1000000, 9999999)}',
+        f'{rng.choice(TITLES)}  {first_name}   {last_name}',
+        f'{rng.randint(1, 200)} {rng.choice(STREETS)}   {suburb} {state} {postcode}',
+        f'Name: {first_name} {last_name}',
+        f'NDIS number: 43{i:07}',
+        f'Date of birth: {format_date(rng.randint(1, 28), rng.randint(1, 12), rng.randint(1940, 2005))}',
+        f'Home number: 02 {rng.randint(1000, 9999)} {rng.randint(1000, 9999)}',
+        f'Mobile: 04{rng.randint(10, 99)} {rng.randint(100, 999)} {rng.randint(100, 999)}',
+        'Preferred contact method: Email',
+        f'{first_name.lower()}.{last_name.lower()}@example.com',
+        f'Plan start date: {format_date(1, start_month, start_year)} '
+        f'NDIS review due date: {format_date(28, start_month, start_year + 1)}'
+    ]
+    lines.extend(generate_filler(rng, filler_lines))
+
+    funded_total = 0
+    for name, heading, supports_type, funding in SECTIONS:
+        lines.append(f'{heading} supports')
+        lines.extend(generate_filler(rng, filler_lines // 3))
+        lines.append(f'Goal/s my {name} supports will help me pursue:')
+        lines.extend(rng.sample(GOALS, min(goals, len(GOALS))))
+        lines.append(funding)
+
+        section_categories = SUPPORTS_CATEGORIES[supports_type]
+        amounts = {
+            category: rng.randint(5, 500) * 10000
+            for category in rng.sample(section_categories, min(categories, len(section_categories)))
+        }
+        section_total = sum(amounts.values())
+
+        # Core supports are one flexible budget, which comes before its breakdown into categories
+        if supports_type == SupportsType.CORE:
+            lines.append(format_amount(section_total))
+
+        for category, amount in amounts.items():
+            lines.append(category)
+            lines.append(format_amount(amount))
+
+        lines.append(f'Total {name} supports')
+        lines.append(format_amount(section_total))
+        funded_total += section_total
+
+        if supports_type == SupportsType.CAPACITY_BUILDING:
+            lines.append('Support coordination')
+            lines.append(rng.choice(MANAGEMENT_TYPES))
+
+        lines.extend(generate_filler(rng, filler_lines // 3))
+
+    lines.append('Total funded supports')
+    lines.append(format_amount(funded_total))
+    lines.extend(generate_filler(rng, filler_lines))
+
+    return lines
+
+
+def write_plan(path, lines):
+    """Writes the paragraphs of a plan into a word document
+
+    Args:
+        path(str): The path of the word document
+        lines(list(str)): The paragraphs of the plan
+
+    Returns:
+        None
+
+    """
+    doc = docx.Document()
+    for line in lines:
+        doc.add_paragraph(line)
+
+    doc.save(path)
+
+
+def generate_corpus(folder, documents=DEFAULT_DOCUMENTS, goals=DEFAULT_GOALS, categories=DEFAULT_CATEGORIES,
+                    pages=DEFAULT_PAGES, seed=0):
+    """Generates a corpus of synthetic plans
+
+    Args:
+        folder(str): The folder to write the word documents to, which is created if it doesn't exist
+        documents(int): The number of plans (optional)
+        goals(int): The number of goals in each supports section (optional)
+        categories(int): The most support categories in each supports section (optional)
+        pages(int): The number of pages of filler text in each plan (optional)
+        seed(int): The seed of the random number generator, so the same corpus can be generated
+            again (optional)
+
+    Returns:
+        list(str): The paths of the word documents
+
+    """
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(seed)
+
+    paths = []
+    for i in range(documents):
+        path = os.path.join(folder, f'plan-{i:05}.docx')
+        write_plan(path, generate_plan(i, rng, goals, categories, pages))
+        paths.append(path)
+
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic NDIS plans.')
+    parser.add_argument('folder', help='the folder to write the word documents to')
+    parser.add_argument('-n', '--documents', type=int, default=DEFAULT_DOCUMENTS,
+                        help='the number of plans (default: %(default)s)')
+    parser.add_argument('--goals', type=int, default=DEFAULT_GOALS,
+                        help='the number of goals in each supports section (default: %(default)s)')
+    parser.add_argument('--categories', type=int, default=DEFAULT_CATEGORIES,
+                        help='the most support categories in each supports section (default: %(default)s)')
+    parser.add_argument('--pages', type=int, default=DEFAULT_PAGES,
+                        help='the number of pages of filler text in each plan (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='the seed of the random number generator (default: %(default)s)')
+    args = parser.parse_args()
+
+    paths = generate_corpus(args.folder, args.documents, args.goals, args.categories, args.pages, args.seed)
+    print(f'Generated {len(paths)} plans in {args.folder}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""Compares the memory used by a synthetic portfolio of Records in the slotted data model against
+the same portfolio held in ordinary classes with a __dict__ per instance and no shared values
+
+Usage:
+    python benchmarks/memory.py [number of records]
+
+"""
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parse import TBC, SUPPORTS_CATEGORIES, Client, Location, Plan, Record, Supports, SupportsType
+
+DEFAULT_RECORDS = 20000
+SUBURBS = ('Springfield NSW 2000', 'Riverside VIC 3000', 'Hillcrest QLD 4000', 'Bayview WA 6000')
+PLAN_DATES = (('01/07/2020', '30/06/2021'), ('01/10/2020', '30/09/2021'), ('01/01/2021', '31/12/2021'))
+SECTIONS = {
+    'Core': SupportsType.CORE,
+    'Capacity Building': SupportsType.CAPACITY_BUILDING,
+    'Capital': SupportsType.CAPITAL
+}
+
+
+class DictObject:
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+def copy(string):
+    """Makes a separate copy of a string, like the parser makes when it slices one out of a document
+
+    Args:
+        string(str): The string to copy
+
+    Returns:
+        str: The copy
+
+    """
+    return (string + '.')[:-1]
+
+
+def generate_fields(i, rng):
+    """Generates the field values of one synthetic plan
+
+    Args:
+        i(int): The index of the plan
+        rng(random.Random): The random number generator to use
+
+    Returns:
+        dict: The field values, each one a separate string object
+
+    """
+    start_date, end_date = rng.choice(PLAN_DATES)
+    supports = {}
+    for section, supports_type in SECTIONS.items():
+        categories = rng.sample(SUPPORTS_CATEGORIES[supports_type], 2)
+        supports[section] = (
+            tuple(copy(f'Goal {j} of participant {i}') for j in range(rng.randint(1, 3))),
+            tuple((copy(category), copy(f'${rng.randint(1, 50)},000.00')) for category in categories),
+            copy(f'${rng.randint(1, 99)},000.00')
+        )
+
+    return {
+        'title': copy(rng.choice(('Mr', 'Ms', 'Mrs'))),
+        'full_name': copy(f'Participant{i} Surname{i}'),
+        'gender': copy(rng.choice(('Male', 'Female'))),
+        'dob': copy(f'{rng.randint(1, 28):02}/01/19{rng.randint(40, 99)}'),
+        'address': copy(f'{i % 200 + 1} Example Street {rng.choice(SUBURBS)}'),
+        'home_phone_number': copy(TBC),
+        'mobile_phone_number': copy(f'04{i:08}'),
+        'email_address': copy(f'participant{i}@example.com'),
+        'ndis_number': copy(f'43{i:07}'),
+        'start_date': copy(start_date),
+        'end_date': copy(end_date),
+        'supports': supports,
+        'support_coordination_management_type': copy(rng.choice(('Plan-managed', 'NDIA-managed'))),
+        'funded_supports_total': copy(f'${rng.randint(10, 200)},000.00')
+    }
+
+
+def build_slotted(fields):
+    """Builds a Record object in the slotted data model
+
+    Args:
+        fields(dict): The field values of a synthetic plan
+
+    Returns:
+        Record: The built Record object
+
+    """
+    return Record(
+        Client(
+            fields['title'],
+            fields['full_name'],
+            fields['gender'],
+            fields['dob'],
+            Location(fields['address']),
+            fields['home_phone_number'],
+            fields['mobile_phone_number'],
+            fields['email_address'],
+            fields['ndis_number']
+        ),
+        Plan(fields['start_date'], fields['end_date']),
+        {section: Supports(*supports) for section, supports in fields['supports'].items()},
+        fields['support_coordination_management_type'],
+        copy(TBC),
+        fields['funded_supports_total'],
+        copy('planmanaged@email.com'),
+        copy(TBC)
+    )
+
+
+def build_dict(fields):
+    """Builds the same Record in ordinary classes, the way the data model used to store it
+
+    Args:
+        fields(dict): The field values of a synthetic plan
+
+    Returns:
+        DictObject: The built Record, as nested ordinary objects
+
+    """
+    first_name, last_name = fields['full_name'].split(' ', 1)
+    house_number, street_1, street_2, suburb, state, postcode = fields['address'].split(' ')
+    return DictObject(
+        client=DictObject(
+            title=fields['title'],
+            full_name=fields['full_name'],
+            first_name=first_name,
+            last_name=last_name,
+            gender=fields['gender'],
+            dob=fields['dob'],
+            address=DictObject(
+                house_number=house_number,
+                street=f'{street_1} {street_2}',
+                suburb=suburb,
+                state=state,
+                postcode=postcode
+            ),
+            home_phone_number=fields['home_phone_number'],
+            mobile_phone_number=fields['mobile_phone_number'],
+            email_address=fields['email_address'],
+            ndis_number=fields['ndis_number']
+        ),
+        plan=DictObject(start_date=fields['start_date'], end_date=fields['end_date']),
+        supports={
+            section: DictObject(goals=goals, categories=categories, total=total)
+            for section, (goals, categories, total) in fields['supports'].items()
+        },
+        support_coordination_management_type=fields['support_coordination_management_type'],
+        support_coordination_hours=copy(TBC),
+        funded_supports_total=fields['funded_supports_total'],
+        additional_email_address=copy('planmanaged@email.com'),
+        service_region_id=copy(TBC)
+    )
+
+
+def measure(build, count):
+    """Measures the memory held by a portfolio of Records
+
+    Args:
+        build(function): Builds a Record from the fields of a synthetic plan
+        count(int): The number of Records in the portfolio
+
+    Returns:
+        int: The number of bytes still allocated once the portfolio is built
+
+    """
+    rng = random.Random(0)
+    tracemalloc.start()
+    portfolio = [build(generate_fields(i, rng)) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del portfolio
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS
+
+    dict_size = measure(build_dict, count)
+    slotted_size = measure(build_slotted, count)
+
+    print(f'Records: {count}')
+    print(f'Ordinary classes: {dict_size / 1024 / 1024:.1f} MiB ({dict_size / count:.0f} bytes/record)')
+    print(f'Slotted classes: {slotted_size / 1024 / 1024:.1f} MiB ({slotted_size / count:.0f} bytes/record)')
+    print(f'Saved: {(1 - slotted_size / dict_size) * 100:.1f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Checks that the raw xml word renderer produces the same documents as the python-docx renderer, and
+compares how long each of them takes
+
+Usage:
+    python benchmarks/renderers.py [number of records]
+
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from export import DOCUMENT_XML_PATH, word_export
+from memory import build_slotted, generate_fields
+
+DEFAULT_RECORDS = 20
+
+
+def compare(path, raw_path):
+    """Compares an output document from each renderer
+
+    Args:
+        path(str): The path of the document rendered by python-docx
+        raw_path(str): The path of the document rendered from raw xml
+
+    Returns:
+        str: A description of the difference, or None if the documents match
+
+    """
+    with zipfile.ZipFile(path) as archive, zipfile.ZipFile(raw_path) as raw_archive:
+        if raw_archive.testzip() is not None:
+            return f'corrupt member {raw_archive.testzip()}'
+
+        if set(archive.namelist()) != set(raw_archive.namelist()):
+            return 'different members'
+
+        if archive.read(DOCUMENT_XML_PATH) != raw_archive.read(DOCUMENT_XML_PATH):
+            return f'different {DOCUMENT_XML_PATH}'
+
+    return None
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS
+    rng = random.Random(0)
+    records = [build_slotted(generate_fields(i, rng)) for i in range(count)]
+
+    # Load the templates before timing either renderer
+    with tempfile.TemporaryDirectory() as folder:
+        word_export(records[0], folder)
+        word_export(records[0], folder, raw_xml=True)
+
+    durations = {}
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as raw_folder:
+        for raw_xml, export_folder in ((False, folder), (True, raw_folder)):
+            start = time.perf_counter()
+            for record in records:
+                word_export(record, export_folder, raw_xml)
+
+            durations[raw_xml] = time.perf_counter() - start
+
+        for filename in sorted(os.listdir(folder)):
+            difference = compare(os.path.join(folder, filename), os.path.join(raw_folder, filename))
+            if difference is not None:
+                mismatches += 1
+                print(f'MISMATCH {filename}: {difference}')
+
+    print(f'Records: {count}')
+    print(f'python-docx: {durations[False] / count * 1000:.1f} ms/record')
+    print(f'Raw xml: {durations[True] / count * 1000:.1f} ms/record')
+    print(f'Speedup: {durations[False] / durations[True]:.1f}x')
+    print(f'Mismatches: {mismatches}')
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
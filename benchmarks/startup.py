@@ -0,0 +1,65 @@
+"""Measures how long each entry point takes to start, by timing fresh interpreters that import it or
+run a quick command with it
+
+Usage:
+    python benchmarks/startup.py [word document] [number of runs]
+
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RUNS = 10
+IMPORTS = ('cli', 'parse', 'export', 'main')
+
+
+def measure(command, runs):
+    """Measures how long a command takes to run in a fresh interpreter
+
+    Args:
+        command(list(str)): The arguments to pass to the interpreter
+        runs(int): The number of times to run the command
+
+    Returns:
+        float: The median time in seconds, or None if the command failed
+
+    """
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, *command],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        durations.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None
+
+    return statistics.median(durations)
+
+
+def main():
+    document = sys.argv[1] if len(sys.argv) > 1 else ''
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RUNS
+
+    commands = [('python (no imports)', ['-c', 'pass'])]
+    commands.extend((f'import {module}', ['-c', f'import {module}']) for module in IMPORTS)
+    commands.append(('cli.py --help', ['cli.py', '--help']))
+    if document:
+        commands.append(('cli.py parse', ['cli.py', 'parse', os.path.abspath(document)]))
+
+    for name, command in commands:
+        duration = measure(command, runs)
+        if duration is None:
+            print(f'{name}: failed')
+        else:
+            print(f'{name}: {duration * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
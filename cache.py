@@ -0,0 +1,202 @@
+import hashlib
+import os
+import sys
+import tempfile
+
+from parse import PARSER_VERSION, build_record_from_bytes
+from serialize import dumps_binary, loads_binary
+
+CACHE_FILE_EXTENSION = '.record'
+DEFAULT_CACHE_FOLDER = os.path.join(os.path.expanduser('~'), '.ndis-doc-parser', 'cache')
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Entries are stored with marshal, whose format may change between Python versions, so each version
+# keeps its own entries
+PYTHON_VERSION = f'{sys.version_info[0]}.{sys.version_info[1]}'
+
+
+def write_file_atomic(path, data):
+    """Writes a file through a temporary file in the same folder, so that other processes, or the
+    next run after a crash, never read a partially written file
+
+    Args:
+        path(str): The path of the file
+        data(bytes): The contents of the file
+
+    Returns:
+        None
+
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class RecordCache:
+    def __init__(self, folder=DEFAULT_CACHE_FOLDER, max_size=DEFAULT_MAX_SIZE):
+        self.folder = folder
+        self.max_size = max_size
+
+        # The total size of the entries, counted when the folder is first scanned and then kept up
+        # to date with this process's writes, so the folder is only scanned again once it looks full.
+        # Writes by other processes sharing the folder are only counted at the next scan
+        self.size = None
+
+        os.makedirs(folder, exist_ok=True)
+
+    def get_key(self, data):
+        """Generates the cache key of a word document
+
+        Args:
+            data(bytes): The contents of a word document
+
+        Returns:
+            str: The cache key, which changes if the document, the parser version or the Python
+                version changes
+
+        """
+        digest = hashlib.sha256(PARSER_VERSION.encode())
+        digest.update(b'\0')
+        digest.update(PYTHON_VERSION.encode())
+        digest.update(b'\0')
+        digest.update(data)
+
+        return digest.hexdigest()
+
+    def get_path(self, key):
+        """Gets the path of a cache entry
+
+        Args:
+            key(str): A cache key
+
+        Returns:
+            str: The absolute path of the cache entry
+
+        """
+        return os.path.join(self.folder, f'{key}{CACHE_FILE_EXTENSION}')
+
+    def get(self, key):
+        """Gets a Record object from the cache
+
+        Args:
+            key(str): A cache key
+
+        Returns:
+            Record: The cached Record object, or None if it isn't in the cache
+
+        """
+        path = self.get_path(key)
+        try:
+            with open(path, 'rb') as file:
+                record = loads_binary(file.read())
+        except (OSError, ValueError, IndexError, UnicodeDecodeError):
+            # The entry isn't cached, another process evicted it while it was being read, or it was
+            # written by an incompatible version of the parser
+            return None
+
+        # Mark the entry as recently used so that it is evicted last. If another process has just
+        # evicted it, or the folder is read-only, the record that was read is still good
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return record
+
+    def put(self, key, record):
+        """Adds a Record object to the cache, evicting the least recently used entries if it is full
+
+        Args:
+            key(str): A cache key
+            record(Record): The Record object to cache
+
+        Returns:
+            None
+
+        """
+        data = dumps_binary(record)
+        write_file_atomic(self.get_path(key), data)
+
+        if self.size is None:
+            self.size = self.scan()[1]
+        else:
+            self.size += len(data)
+
+        if self.size > self.max_size:
+            self.evict()
+
+    def scan(self):
+        """Lists the entries in the cache folder
+
+        Returns:
+            (list((float, int, str)), int): A 2-tuple containing the mtime, size and path of each
+                entry, and the total size of the entries
+
+        """
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.folder):
+            if not entry.name.endswith(CACHE_FILE_EXTENSION):
+                continue
+
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+        return entries, total_size
+
+    def evict(self):
+        """Deletes the least recently used entries until the cache fits within its size limit
+
+        Returns:
+            None
+
+        """
+        entries, total_size = self.scan()
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another process already evicted it
+                pass
+
+            total_size -= size
+
+        self.size = total_size
+
+    def build_record(self, path):
+        """Builds a Record object from a document, using the cached one if the document was parsed before
+
+        Args:
+            path(str): The path to a word document
+
+        Returns:
+            Record: The built Record object
+
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        key = self.get_key(data)
+        record = self.get(key)
+        if record is None:
+            record = build_record_from_bytes(data)
+            self.put(key, record)
+
+        return record
@@ -0,0 +1,112 @@
+import argparse
+import os
+import sys
+
+
+def build_record(path, cache_folder=''):
+    """Builds a Record object from a document
+
+    Args:
+        path(str): The path to a word document
+        cache_folder(str): A folder to cache parsed documents in, or '' to not use a cache (optional)
+
+    Returns:
+        Record: The built Record object
+
+    """
+    if cache_folder:
+        from cache import RecordCache
+
+        return RecordCache(cache_folder).build_record(path)
+
+    from parse import build_record_from_document
+
+    return build_record_from_document(path)
+
+
+def parse_command(args):
+    """Prints the data parsed from a document
+
+    Args:
+        args(argparse.Namespace): The parsed command line arguments
+
+    Returns:
+        int: The exit code
+
+    """
+    record = build_record(args.document, args.cache_folder)
+    if args.json:
+        from serialize import dumps_json
+
+        print(dumps_json(record))
+    else:
+        print(record)
+
+    return 0
+
+
+def export_command(args):
+    """Exports the data parsed from a document into the output documents
+
+    Args:
+        args(argparse.Namespace): The parsed command line arguments
+
+    Returns:
+        int: The exit code
+
+    """
+    record = build_record(args.document, args.cache_folder)
+
+    from export import export_all
+
+    export_folder = os.path.abspath(args.output_folder)
+    os.makedirs(export_folder, exist_ok=True)
+    export_all(record, export_folder, args.raw_xml, args.excel, args.upsert)
+
+    return 0
+
+
+def main(argv=None):
+    """Runs a command
+
+    Args:
+        argv(list(str)): The command line arguments (optional)
+
+    Returns:
+        int: The exit code
+
+    """
+    # Nothing beyond the standard library is imported until a command needs it, so that short
+    # scripted jobs don't pay for importing the GUI or the exporters' dependencies
+    parser = argparse.ArgumentParser(description='Parse and export NDIS plans without the GUI.')
+    parser.add_argument('-c', '--cache-folder', default='',
+                        help='a folder to cache parsed documents in, so unchanged ones are skipped')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    parse_parser = commands.add_parser('parse', help='print the data parsed from a document')
+    parse_parser.add_argument('document', help='the word document to parse')
+    parse_parser.add_argument('--json', action='store_true', help='print the data as JSON')
+    parse_parser.set_defaults(function=parse_command)
+
+    export_parser = commands.add_parser('export', help='export a document into the output documents')
+    export_parser.add_argument('document', help='the word document to parse')
+    export_parser.add_argument('output_folder', help='the folder to export to')
+    export_parser.add_argument('--excel', default='',
+                               help='an excel document to add the data to instead of creating a new one')
+    export_parser.add_argument('--upsert', action='store_true',
+                               help="update the client's row in the excel document if they are already in it")
+    export_parser.add_argument('--raw-xml', action='store_true',
+                               help='render the word documents without python-docx, which is faster')
+    export_parser.set_defaults(function=export_command)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.function(args)
+    except Exception as e:
+        print(f'{type(e).__name__}: {e}', file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
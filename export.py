@@ -1,12 +1,49 @@
+import io
 import os
-import shutil
+import re
 import docx
+import threading
+import zipfile
 
 from datetime import datetime
-from openpyxl import load_workbook
-from parse import TBC
-
-RESOURCES_FOLDER = os.path.abspath('resources')
+from lxml import etree
+from openpyxl import Workbook, load_workbook
+from parse import DOCUMENT_XML_PATH, PARAGRAPH_TAG, TAB_TAG, TBC, TEXT_TAG, WORD_NAMESPACE
+
+RESOURCES_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+MAX_GOALS = 12
+
+# The column of the output excel documents that identifies each client, counting from 1
+NDIS_NUMBER_COLUMN = 17
+
+PLACEHOLDER_PATTERN = re.compile(
+    r'\[(?:title|full_name|dob|gender|address|house_number|street|suburb|state|home_phone_number|'
+    r'mobile_phone_number|email_address|ndis_number|plan_start_date|plan_end_date|'
+    r'(?:core|capacity_building|capital)_supports_(?:categories|total)|funded_supports_total|'
+    r'support_coordination_hours|goal|sc1|sc2)\]'
+)
+
+RUN_TAG = f'{WORD_NAMESPACE}r'
+HYPERLINK_TAG = f'{WORD_NAMESPACE}hyperlink'
+PARAGRAPH_PROPERTIES_TAG = f'{WORD_NAMESPACE}pPr'
+BREAK_TAG = f'{WORD_NAMESPACE}br'
+BREAK_TYPE_ATTRIBUTE = f'{WORD_NAMESPACE}type'
+RUN_TEXT_TAGS = {
+    TEXT_TAG: None,
+    TAB_TAG: '\t',
+    f'{WORD_NAMESPACE}ptab': '\t',
+    f'{WORD_NAMESPACE}cr': '\n',
+    f'{WORD_NAMESPACE}noBreakHyphen': '-'
+}
+SPACE_ATTRIBUTE = '{http://www.w3.org/XML/1998/namespace}space'
+RUN_CONTENT_PATTERN = re.compile(r'(\t|[\r\n])')
+WORD_COMPRESS_LEVEL = 1
+
+# Parses the same way python-docx does, so documents serialize identically
+XML_PARSER = etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+
+# The output documents loaded into memory, by path and the class they were loaded with
+templates = {}
 
 
 def get_new_filename(record, document_name, file_extension):
@@ -37,42 +74,69 @@ def get_new_filename(record, document_name, file_extension):
     return new_filename
 
 
-def copy_resources_to_export(record, export_folder, file_extension):
-    """Copies all files with the given extension from the resources folder to the export folder
+def get_batch_filename(document_name, file_extension):
+    """Generates the filename of an output document that holds the data of many records
+
+    Args:
+        document_name(str): The name of the document that is being exported
+        file_extension(str): The file extension of the document
+
+    Returns:
+        str: The new filename
+
+    """
+    now = datetime.now()
+    return f'{document_name} - {now.year} {now.strftime("%b")}.{file_extension}'
+
+
+def get_resources(file_extension):
+    """Gets all files with the given extension in the resources folder
+
+    Args:
+        file_extension(str): The file extension of the documents to get
+
+    Returns:
+        list(str): The list of resource file absolute paths
+
+    """
+    return [
+        os.path.join(RESOURCES_FOLDER, item)
+        for item in os.listdir(RESOURCES_FOLDER)
+        if item.endswith(f'.{file_extension}')
+    ]
+
+
+def get_export_paths(record, export_folder, file_extension):
+    """Pairs each file with the given extension in the resources folder with its path in the export folder
 
     Args:
         record(Record): A Record object
         export_folder(str): The absolute path of the folder to export to
-        file_extension(str): The file extension of the documents to copy
+        file_extension(str): The file extension of the documents to export
 
     Returns:
-        list(str): The list of destination file absolute paths
+        list((str, str)): The list of resource and destination file absolute paths
 
     """
     paths = []
-    for item in os.listdir(RESOURCES_FOLDER):
-        if not item.endswith(f'.{file_extension}'):
-            continue
-
+    for src in get_resources(file_extension):
+        item = os.path.basename(src)
         document_name = item[:item.index(f'.{file_extension}')]
-        src = os.path.join(RESOURCES_FOLDER, item)
         dst = os.path.join(export_folder, get_new_filename(record, document_name, file_extension))
-        shutil.copyfile(src, dst)
 
-        paths.append(dst)
+        paths.append((src, dst))
 
     return paths
 
 
-def word_export(record, export_folder):
-    """Exports the data in a Record object into all of the output word documents
+def get_placeholder_values(record):
+    """Gets the text that each placeholder in the output word documents is replaced with
 
     Args:
         record(Record): A Record object
-        export_folder(str): The absolute path of the folder to export to
 
     Returns:
-        None
+        dict(str, str): The placeholders mapped to their replacement text, in replacement order
 
     """
     placeholder_to_val = {
@@ -101,75 +165,442 @@ def word_export(record, export_folder):
         '[support_coordination_hours]': record.support_coordination_hours
     }
 
+    for placeholder, value in placeholder_to_val.items():
+        if 'categories' in placeholder and value != TBC:
+            placeholder_to_val[placeholder] = ''.join(
+                f'{category[0]}: {category[1]}\n' for category in value
+            )
+
+    return placeholder_to_val
+
+
+def get_goals(record):
+    """Gets the goals that the [goal] placeholders in the output word documents are replaced with
+
+    Args:
+        record(Record): A Record object
+
+    Returns:
+        list(str): The goals of every supports section, padded with blank goals up to MAX_GOALS
+
+    """
     goals = []
     for value in record.supports.values():
         if value.goals != TBC:
             for goal in value.goals:
                 goals.append(goal)
 
-    goals.extend(['' for _ in range(12 - len(goals))])
-
-    def search_and_replace(paragraph):
-        for placeholder in placeholder_to_val.keys():
-            if placeholder in paragraph.text:
-                value = placeholder_to_val[placeholder]
-                if 'categories' in placeholder:
-                    if value == TBC:
-                        string = TBC
-                    else:
-                        string = ''
-                        for category in value:
-                            string += f'{category[0]}: {category[1]}\n'
-                else:
-                    string = value
-
-                paragraph.text = paragraph.text.replace(
-                    placeholder,
-                    string
-                )
-            elif '[goal]' in paragraph.text:
-                paragraph.text = paragraph.text.replace('[goal]', goals[0])
-                goals.pop(0)
-            elif '[sc1]' in paragraph.text:
-                if record.support_coordination_management_type.lower() == 'ndia-managed':
-                    paragraph.text = '   X'
-                else:
-                    paragraph.text = ''
-            elif '[sc2]' in paragraph.text:
-                if record.support_coordination_management_type.lower() == 'self-managed':
-                    paragraph.text = '   X'
+    goals.extend(['' for _ in range(MAX_GOALS - len(goals))])
+    return goals
+
+
+def replace_placeholders(text, placeholder_to_val, goals, management_type):
+    """Replaces the placeholders in the text of a paragraph
+
+    Args:
+        text(str): The text of a paragraph
+        placeholder_to_val(dict(str, str)): The placeholders mapped to their replacement text
+        goals(list(str)): The goals left to fill [goal] placeholders with, which are used up in order
+        management_type(str): The support coordination management type of the record
+
+    Returns:
+        str: The text with its placeholders replaced, or None if it didn't contain any
+
+    """
+    changed = False
+    for placeholder, value in placeholder_to_val.items():
+        if placeholder in text:
+            text = text.replace(placeholder, value)
+        elif '[goal]' in text:
+            text = text.replace('[goal]', goals[0])
+            goals.pop(0)
+        elif '[sc1]' in text:
+            text = '   X' if management_type.lower() == 'ndia-managed' else ''
+        elif '[sc2]' in text:
+            text = '   X' if management_type.lower() == 'self-managed' else ''
+        else:
+            continue
+
+        changed = True
+
+    return text if changed else None
+
+
+class Template:
+    def __init__(self, path):
+        """Reads an output document into memory
+
+        Args:
+            path(str): The path of the document
+
+        """
+        self.path = path
+        self.mtime = os.stat(path).st_mtime_ns
+        with open(path, 'rb') as file:
+            self.data = file.read()
+
+    def is_stale(self):
+        """Checks whether the document has changed since it was read
+
+        Returns:
+            bool: True if the document was modified or deleted, False otherwise
+
+        """
+        try:
+            return os.stat(self.path).st_mtime_ns != self.mtime
+        except OSError:
+            return True
+
+    def open(self):
+        """Opens a fresh copy of the document from memory
+
+        Returns:
+            io.BytesIO: The contents of the document
+
+        """
+        return io.BytesIO(self.data)
+
+
+class WordTemplate(Template):
+    def __init__(self, path):
+        """Reads an output word document into memory and scans it once for the paragraphs that
+        contain placeholders
+
+        Args:
+            path(str): The path of the word document
+
+        """
+        super().__init__(path)
+
+        doc = docx.Document(self.open())
+        self.locations = self.scan(doc)
+
+        # The number of goals rendering uses up, counting paragraphs visited more than once only once
+        row_cells = {}
+        paragraphs = (self.find(doc, location, row_cells) for location in self.locations)
+        self.goal_count = len({paragraph._p for paragraph in paragraphs if '[goal]' in paragraph.text})
+
+    @staticmethod
+    def scan(doc):
+        """Finds the paragraphs of a word document that contain placeholders
+
+        Args:
+            doc(docx.Document): The word document
+
+        Returns:
+            list(tuple): The locations of the paragraphs, each either ('paragraph', paragraph) or
+                ('cell', table, row, cell, paragraph), in the order the document's paragraphs and
+                then its tables are visited in
+
+        """
+        locations = []
+        for i, paragraph in enumerate(doc.paragraphs):
+            if PLACEHOLDER_PATTERN.search(paragraph.text):
+                locations.append(('paragraph', i))
+
+        for t, table in enumerate(doc.tables):
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    for p, paragraph in enumerate(cell.paragraphs):
+                        if PLACEHOLDER_PATTERN.search(paragraph.text):
+                            locations.append(('cell', t, r, c, p))
+
+        return locations
+
+    @staticmethod
+    def find(doc, location, row_cells):
+        """Finds the paragraph at a location found by scan
+
+        Args:
+            doc(docx.Document): The word document
+            location(tuple): The location of the paragraph
+            row_cells(dict): The cells of the rows found so far, by table and row index, which is
+                shared between calls so each row's cells are only built once
+
+        Returns:
+            docx.text.paragraph.Paragraph: The paragraph
+
+        """
+        if location[0] == 'paragraph':
+            return doc.paragraphs[location[1]]
+
+        _, t, r, c, p = location
+        if (t, r) not in row_cells:
+            row_cells[(t, r)] = doc.tables[t].rows[r].cells
+
+        return row_cells[(t, r)][c].paragraphs[p]
+
+    def render(self, placeholder_to_val, goals, management_type):
+        """Replaces the placeholders in a fresh copy of the template
+
+        Only the paragraphs found when the template was scanned are visited
+
+        Args:
+            placeholder_to_val(dict(str, str)): The placeholders mapped to their replacement text
+            goals(list(str)): The goals left to fill [goal] placeholders with
+            management_type(str): The support coordination management type of the record
+
+        Returns:
+            docx.Document: The rendered document
+
+        """
+        doc = docx.Document(self.open())
+        row_cells = {}
+        for location in self.locations:
+            paragraph = self.find(doc, location, row_cells)
+            text = replace_placeholders(paragraph.text, placeholder_to_val, goals, management_type)
+            if text is not None:
+                paragraph.text = text
+
+        return doc
+
+
+def get_run_text(run):
+    """Gets the text of a run element the same way python-docx does
+
+    Args:
+        run(etree._Element): A w:r element
+
+    Returns:
+        str: The text of the run
+
+    """
+    text = ''
+    for element in run:
+        if element.tag == TEXT_TAG:
+            text += element.text or ''
+        elif element.tag == BREAK_TAG:
+            if element.get(BREAK_TYPE_ATTRIBUTE, 'textWrapping') == 'textWrapping':
+                text += '\n'
+        elif element.tag in RUN_TEXT_TAGS:
+            text += RUN_TEXT_TAGS[element.tag]
+
+    return text
+
+
+def get_paragraph_text(paragraph):
+    """Gets the text of a paragraph element the same way python-docx does, joining the text of all
+    of its runs so that placeholders split across runs are found
+
+    Args:
+        paragraph(etree._Element): A w:p element
+
+    Returns:
+        str: The text of the paragraph
+
+    """
+    text = ''
+    for element in paragraph:
+        if element.tag == RUN_TAG:
+            text += get_run_text(element)
+        elif element.tag == HYPERLINK_TAG:
+            for run in element:
+                if run.tag == RUN_TAG:
+                    text += get_run_text(run)
+
+    return text
+
+
+def set_paragraph_text(paragraph, text):
+    """Replaces the contents of a paragraph element with a single run, the same way python-docx does
+
+    Args:
+        paragraph(etree._Element): A w:p element
+        text(str): The new text of the paragraph
+
+    Returns:
+        None
+
+    """
+    for element in list(paragraph):
+        if element.tag != PARAGRAPH_PROPERTIES_TAG:
+            paragraph.remove(element)
+
+    run = etree.SubElement(paragraph, RUN_TAG)
+    for content in RUN_CONTENT_PATTERN.split(text):
+        if content == '\t':
+            etree.SubElement(run, TAB_TAG)
+        elif content in ('\r', '\n'):
+            etree.SubElement(run, BREAK_TAG)
+        elif content:
+            element = etree.SubElement(run, TEXT_TAG)
+            element.text = content
+            if len(content.strip()) < len(content):
+                element.set(SPACE_ATTRIBUTE, 'preserve')
+
+
+class RawWordTemplate(Template):
+    def __init__(self, path):
+        """Reads an output word document into memory for rendering without python-docx
+
+        The document's xml is parsed once and shared by every render, and every other part of the
+        document is compressed once into an archive that each output starts as a copy of, so only the
+        rendered xml is compressed per output
+
+        Args:
+            path(str): The path of the word document
+
+        """
+        super().__init__(path)
+
+        # The w:p elements of the same paragraphs python-docx would visit, in the same order
+        self.visits = []
+
+        # Renders edit the shared xml in place and then undo their edits, so only one runs at a time
+        self.lock = threading.Lock()
+
+        # The zip of every part of the document except its xml, which each render adds to a copy of
+        base = io.BytesIO()
+        with zipfile.ZipFile(self.open()) as archive, zipfile.ZipFile(base, 'w') as base_archive:
+            for info in archive.infolist():
+                if info.filename == DOCUMENT_XML_PATH:
+                    self.document_info = info
+                    self.root = etree.fromstring(archive.read(info), XML_PARSER)
                 else:
-                    paragraph.text = ''
+                    # Media the template stores uncompressed, because it is already compressed,
+                    # stays stored
+                    base_archive.writestr(info, archive.read(info))
+
+        self.base = base.getvalue()
+
+        # Visit the paragraphs in the same order, and as many times, as WordTemplate does
+        doc = docx.Document(self.open())
+        indexes = {paragraph: i for i, paragraph in enumerate(doc.element.iter(PARAGRAPH_TAG))}
+        paragraphs = list(self.root.iter(PARAGRAPH_TAG))
+        for location in WordTemplate.scan(doc):
+            self.visits.append(paragraphs[indexes[WordTemplate.find(doc, location, {})._p]])
+
+        self.goal_count = len({
+            paragraph for paragraph in self.visits if '[goal]' in get_paragraph_text(paragraph)
+        })
+
+    def render(self, placeholder_to_val, goals, management_type, path):
+        """Replaces the placeholders in a copy of the template's xml and writes the output document
+
+        Args:
+            placeholder_to_val(dict(str, str)): The placeholders mapped to their replacement text
+            goals(list(str)): The goals left to fill [goal] placeholders with
+            management_type(str): The support coordination management type of the record
+            path(str): The path to write the output document to
+
+        Returns:
+            None
+
+        """
+        with self.lock:
+            # The original contents of each edited paragraph, in the order they were edited
+            edits = []
+            try:
+                for paragraph in self.visits:
+                    text = replace_placeholders(
+                        get_paragraph_text(paragraph),
+                        placeholder_to_val,
+                        goals,
+                        management_type
+                    )
+                    if text is not None:
+                        edits.append((paragraph, list(paragraph)))
+                        set_paragraph_text(paragraph, text)
+
+                xml = etree.tostring(self.root, encoding='UTF-8', standalone=True)
+            finally:
+                # Undo the edits in reverse, so paragraphs nested in edited paragraphs are restored too
+                for paragraph, children in reversed(edits):
+                    paragraph[:] = children
+
+        with open(path, 'wb') as file:
+            file.write(self.base)
+
+        # The xml is compressed quickly rather than small, since it is compressed for every output
+        member = zipfile.ZipInfo(DOCUMENT_XML_PATH, self.document_info.date_time)
+        member.compress_type = zipfile.ZIP_DEFLATED
+        member.external_attr = self.document_info.external_attr
+        with zipfile.ZipFile(path, 'a') as archive:
+            archive.writestr(member, xml, compresslevel=WORD_COMPRESS_LEVEL)
+
+
+def get_template(path, template_class=Template):
+    """Gets an output document from memory, reading it again if it changed on disk since it was read
 
-    paths = copy_resources_to_export(record, export_folder, 'docx')
-    for path in paths:
-        doc = docx.Document(path)
-        for paragraph in doc.paragraphs:
-            search_and_replace(paragraph)
+    Args:
+        path(str): The path of the document
+        template_class(type): The class to load the document with, Template or WordTemplate (optional)
 
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        search_and_replace(paragraph)
+    Returns:
+        Template: The loaded document
+
+    """
+    # Each class keeps its own copy, so renderers that share a document don't keep reloading it
+    key = (path, template_class)
+    template = templates.get(key)
+    if template is None or template.is_stale():
+        template = templates[key] = template_class(path)
 
-        doc.save(path)
+    return template
 
 
-def excel_export(record, export_folder='', optional_xml_path=''):
-    """Exports the data in a Record object into all of the output excel documents
+def word_export_template(record, src, dst, goals, raw_xml=False):
+    """Exports the data in a Record object into one of the output word documents
 
     Args:
         record(Record): A Record object
-        export_folder(str): The absolute path of the folder to export to (optional)
-        optional_xml_path(str): The path of an xml document to append data to if a new one
-            should not be created (optional)
+        src(str): The path of the word document in the resources folder
+        dst(str): The path to export the word document to
+        goals(list(str)): The goals left to fill [goal] placeholders with, which are used up in order
+        raw_xml(bool): Whether to render the document's xml directly instead of through python-docx
+            (optional)
+
+    Returns:
+        None
+
+    """
+    placeholder_to_val = get_placeholder_values(record)
+    if raw_xml:
+        get_template(src, RawWordTemplate).render(
+            placeholder_to_val,
+            goals,
+            record.support_coordination_management_type,
+            dst
+        )
+    else:
+        doc = get_template(src, WordTemplate).render(
+            placeholder_to_val,
+            goals,
+            record.support_coordination_management_type
+        )
+        doc.save(dst)
+
+
+def word_export(record, export_folder, raw_xml=False):
+    """Exports the data in a Record object into all of the output word documents
+
+    Args:
+        record(Record): A Record object
+        export_folder(str): The absolute path of the folder to export to
+        raw_xml(bool): Whether to render the documents' xml directly instead of through python-docx,
+            which is much faster and produces the same document text (optional)
 
     Returns:
         None
 
     """
-    data = (
+    # The goals are shared between the documents, each one using up the next ones
+    goals = get_goals(record)
+    for src, dst in get_export_paths(record, export_folder, 'docx'):
+        word_export_template(record, src, dst, goals, raw_xml)
+
+
+def get_excel_row(record):
+    """Gets the row of data that represents a Record object in the output excel documents
+
+    Args:
+        record(Record): A Record object
+
+    Returns:
+        tuple: The values of each cell in the row
+
+    """
+    return (
         record.client.title,
         'CLIENT',
         record.client.first_name,
@@ -215,17 +646,178 @@ def excel_export(record, export_folder='', optional_xml_path=''):
         'Megan King'
     )
 
+
+def get_ndis_number(row):
+    """Gets the NDIS number in a row of an excel document
+
+    Args:
+        row(tuple): The values of each cell in the row
+
+    Returns:
+        str: The NDIS number, or None if the row doesn't have one
+
+    """
+    ndis_number = row[NDIS_NUMBER_COLUMN - 1] if len(row) >= NDIS_NUMBER_COLUMN else None
+    if ndis_number in (None, '', TBC):
+        return None
+
+    # Numbers typed in by hand may have been stored as numbers instead of text
+    return str(ndis_number).strip()
+
+
+def merge_excel_rows(rows, new_rows):
+    """Replaces the rows of clients who are already in a list of rows and appends the rest
+
+    Args:
+        rows(list(tuple)): The rows of an excel document, which are changed in place
+        new_rows(iterable(tuple)): The rows to add, as returned by get_excel_row
+
+    Returns:
+        None
+
+    """
+    index = {}
+    for i, row in enumerate(rows):
+        ndis_number = get_ndis_number(row)
+        if ndis_number is not None:
+            index[ndis_number] = i
+
+    for row in new_rows:
+        ndis_number = get_ndis_number(row)
+        if ndis_number in index:
+            rows[index[ndis_number]] = row
+        else:
+            if ndis_number is not None:
+                index[ndis_number] = len(rows)
+
+            rows.append(row)
+
+
+def upsert_excel_rows(ws, new_rows):
+    """Updates the rows of clients who are already in a worksheet in place and appends the rest
+
+    Args:
+        ws(openpyxl.worksheet.worksheet.Worksheet): The worksheet
+        new_rows(iterable(tuple)): The rows to add, as returned by get_excel_row
+
+    Returns:
+        None
+
+    """
+    # Find every client's row once, instead of searching the worksheet for each new row
+    index = {}
+    for row_number, row in enumerate(ws.iter_rows(max_col=NDIS_NUMBER_COLUMN, values_only=True), 1):
+        ndis_number = get_ndis_number(row)
+        if ndis_number is not None:
+            index[ndis_number] = row_number
+
+    for row in new_rows:
+        ndis_number = get_ndis_number(row)
+        if ndis_number not in index:
+            ws.append(row)
+            if ndis_number is not None:
+                index[ndis_number] = ws.max_row
+            continue
+
+        for column, value in enumerate(row, 1):
+            ws.cell(row=index[ndis_number], column=column, value=value)
+
+
+def excel_export(record, export_folder='', optional_xml_path='', upsert=False):
+    """Exports the data in a Record object into all of the output excel documents
+
+    Args:
+        record(Record): A Record object
+        export_folder(str): The absolute path of the folder to export to (optional)
+        optional_xml_path(str): The path of an xml document to append data to if a new one
+            should not be created (optional)
+        upsert(bool): Whether to update the client's row if they are already in the document
+            instead of appending another one (optional)
+
+    Returns:
+        None
+
+    """
     if export_folder:
-        path = copy_resources_to_export(record, export_folder, 'xlsx')[0]
+        src, path = get_export_paths(record, export_folder, 'xlsx')[0]
+        wb = load_workbook(filename=get_template(src).open())
     else:
         path = optional_xml_path
+        wb = load_workbook(filename=path)
 
-    wb = load_workbook(filename=path)
     ws = wb.active
-    ws.append(data)
+    if upsert:
+        upsert_excel_rows(ws, [get_excel_row(record)])
+    else:
+        ws.append(get_excel_row(record))
+
     wb.save(path)
 
 
+def excel_export_batch(records, export_folder='', optional_xml_path='', upsert=False):
+    """Exports the data in many Record objects into the output excel documents, loading and saving
+    each workbook only once
+
+    Args:
+        records(iterable(Record)): The Record objects to export
+        export_folder(str): The absolute path of the folder to create a new document in, which is
+            streamed row by row so memory use doesn't grow with the number of records (optional)
+        optional_xml_path(str): The path of an xml document to append data to if a new one
+            should not be created (optional)
+        upsert(bool): Whether to update the rows of clients who are already in the document, or
+            earlier in the records, instead of appending more rows for them (optional)
+
+    Returns:
+        list(str): The paths of the documents that were written to
+
+    """
+    # The records are gone through once per document, so a generator would only fill the first one
+    records = list(records)
+
+    if not export_folder:
+        wb = load_workbook(filename=optional_xml_path)
+        ws = wb.active
+        if upsert:
+            upsert_excel_rows(ws, (get_excel_row(record) for record in records))
+        else:
+            for record in records:
+                ws.append(get_excel_row(record))
+
+        wb.save(optional_xml_path)
+        return [optional_xml_path]
+
+    paths = []
+    for src in get_resources('xlsx'):
+        item = os.path.basename(src)
+
+        # Write-only workbooks can't be opened from a file, so copy the template's rows across
+        template_wb = load_workbook(filename=get_template(src).open(), read_only=True)
+        template_ws = template_wb.active
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=template_ws.title)
+        rows = template_ws.iter_rows(values_only=True)
+        if upsert:
+            # Rows can't be changed once they are written to a write-only workbook, so merge them first
+            rows = list(rows)
+            merge_excel_rows(rows, (get_excel_row(record) for record in records))
+
+        for row in rows:
+            ws.append(row)
+
+        template_wb.close()
+
+        if not upsert:
+            for record in records:
+                ws.append(get_excel_row(record))
+
+        path = os.path.join(export_folder, get_batch_filename(item[:item.index('.xlsx')], 'xlsx'))
+        wb.save(path)
+        paths.append(path)
+
+    return paths
+
+
 def record_export(record, export_folder):
     """Exports the data in a Record object into a blank text file
 
@@ -240,3 +832,29 @@ def record_export(record, export_folder):
     export_path = os.path.join(export_folder, get_new_filename(record, 'Data', 'txt'))
     with open(export_path, 'w') as file:
         file.write(str(record))
+
+
+def export_all(record, export_folder, raw_xml=False, optional_xml_path='', upsert=False):
+    """Exports the data in a Record object into all of the output documents
+
+    Args:
+        record(Record): A Record object
+        export_folder(str): The absolute path of the folder to export to
+        raw_xml(bool): Whether to render the word documents' xml directly instead of through
+            python-docx (optional)
+        optional_xml_path(str): The path of an excel document to add the record to instead of
+            creating a new one in the export folder (optional)
+        upsert(bool): Whether to update the client's row in that excel document if they are already
+            in it instead of appending another one (optional)
+
+    Returns:
+        None
+
+    """
+    if optional_xml_path:
+        excel_export(record, optional_xml_path=optional_xml_path, upsert=upsert)
+    else:
+        excel_export(record, export_folder=export_folder)
+
+    record_export(record, export_folder)
+    word_export(record, export_folder, raw_xml)
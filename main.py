@@ -1,7 +1,11 @@
-from parse import build_record_from_document, build_record_from_string
-from export import word_export, excel_export, record_export
+from functools import partial
+from parse import build_record_from_string
+from export import excel_export, get_export_paths, get_goals, record_export, word_export_template
+from cache import RecordCache
 import PySimpleGUI as sg
+import os
 import subprocess as sp
+import threading
 
 VERSION = '1.0.2'
 TITLE = f'NDIS Document Parser Application v{VERSION}'
@@ -13,7 +17,8 @@ INPUT_DOCUMENT_ROW = [
 EXCEL_DOCUMENT_ROW = [
     sg.Text('Output Excel Document (Optional):', size=(25, 1)),
     sg.In(key='-OUTPUT EXCEL TEXT-', size=(60, 1), disabled=True, enable_events=True),
-    sg.FileBrowse(file_types=(('Excel Documents', '*.xlsx'),))
+    sg.FileBrowse(file_types=(('Excel Documents', '*.xlsx'),)),
+    sg.Checkbox('Update existing clients', key='-UPSERT CHECKBOX-', default=False)
 ]
 OUTPUT_FOLDER_ROW = [
     sg.Text('Output Folder:', size=(25, 1)),
@@ -30,16 +35,27 @@ MULTILINE = [
         disabled=True
     )
 ]
+STATUS_ROW = [
+    sg.Text('', key='-STATUS TEXT-', size=(60, 1)),
+    sg.ProgressBar(1, orientation='h', size=(30, 15), key='-PROGRESS BAR-')
+]
 EXPORT = [
-    sg.Button('Export Data', key='-EXPORT BUTTON-', size=(10, 2), disabled=True)
+    sg.Button('Export Data', key='-EXPORT BUTTON-', size=(10, 2), disabled=True),
+    sg.Button('Cancel', key='-CANCEL BUTTON-', size=(10, 2), disabled=True)
 ]
 COLUMN = [
     INPUT_DOCUMENT_ROW,
     EXCEL_DOCUMENT_ROW,
     OUTPUT_FOLDER_ROW,
     MULTILINE,
+    STATUS_ROW,
     EXPORT
 ]
+
+# Events sent to the window by the background workers
+PROGRESS_EVENT = '-PROGRESS-'
+IMPORT_DONE_EVENT = '-IMPORT DONE-'
+EXPORT_DONE_EVENT = '-EXPORT DONE-'
 LAYOUT = [
     [
         sg.Column(COLUMN, element_justification='center')
@@ -85,6 +101,99 @@ class ScrolledText(sg.tk.Text):
         return str(self.frame)
 
 
+def import_worker(window, record_cache, path, cancel):
+    """Builds a Record object from a document in the background, then sends it to the window
+
+    Args:
+        window(sg.Window): The window to send the result to
+        record_cache(RecordCache): The cache to build the Record object with
+        path(str): The path to a word document
+        cancel(threading.Event): Set when the user cancels the import
+
+    Returns:
+        None
+
+    """
+    window.write_event_value(PROGRESS_EVENT, (0, 1, 'Importing...'))
+    try:
+        record = record_cache.build_record(path)
+    except Exception as e:
+        window.write_event_value(IMPORT_DONE_EVENT, (None, f'{type(e).__name__}: {e}'))
+        return
+
+    # The document can't be abandoned partway through parsing, so just throw away the result
+    if cancel.is_set():
+        window.write_event_value(IMPORT_DONE_EVENT, (None, None))
+    else:
+        window.write_event_value(IMPORT_DONE_EVENT, (record, None))
+
+
+def export_worker(window, record, output_folder_path, output_excel_path, upsert, cancel):
+    """Exports the data in a Record object in the background, sending the window its progress
+
+    Args:
+        window(sg.Window): The window to send the progress to
+        record(Record): A Record object
+        output_folder_path(str): The absolute path of the folder to export to
+        output_excel_path(str): The path of an excel document to append data to, or '' to create
+            a new one
+        upsert(bool): Whether to update the client's row in the excel document if they are already
+            in it instead of appending another one
+        cancel(threading.Event): Set when the user cancels the export, which stops it before the
+            next document
+
+    Returns:
+        None
+
+    """
+    if output_excel_path:
+        excel_step = partial(excel_export, record, optional_xml_path=output_excel_path, upsert=upsert)
+    else:
+        excel_step = partial(excel_export, record, export_folder=output_folder_path)
+
+    steps = [
+        ('Careview Client Profile', excel_step),
+        ('Data', partial(record_export, record, output_folder_path))
+    ]
+
+    # The goals are shared between the word documents, each one using up the next ones
+    goals = get_goals(record)
+    for src, dst in get_export_paths(record, output_folder_path, 'docx'):
+        name = os.path.splitext(os.path.basename(src))[0]
+        steps.append((name, partial(word_export_template, record, src, dst, goals)))
+
+    try:
+        for i, (name, step) in enumerate(steps):
+            if cancel.is_set():
+                window.write_event_value(EXPORT_DONE_EVENT, (False, None))
+                return
+
+            window.write_event_value(PROGRESS_EVENT, (i, len(steps), f'Exporting {name}...'))
+            step()
+    except Exception as e:
+        window.write_event_value(EXPORT_DONE_EVENT, (False, f'{type(e).__name__}: {e}'))
+        return
+
+    window.write_event_value(EXPORT_DONE_EVENT, (True, None))
+
+
+def set_busy(window, busy):
+    """Disables the buttons that start a job while one is running, and enables the cancel button
+
+    Args:
+        window(sg.Window): The window
+        busy(bool): Whether a job is running
+
+    Returns:
+        None
+
+    """
+    window['-INPUT FILEBROWSE-'].update(disabled=busy)
+    window['-CANCEL BUTTON-'].update(disabled=not busy)
+    if busy:
+        window['-EXPORT BUTTON-'].update(disabled=True)
+
+
 def handle_window():
     """Create the window and handle its events
 
@@ -93,27 +202,73 @@ def handle_window():
 
     """
     window = sg.Window(TITLE, LAYOUT)
+    record_cache = RecordCache()
 
     output_excel_text = window['-OUTPUT EXCEL TEXT-']
     output_folder_text = window['-OUTPUT FOLDER TEXT-']
     data_multiline = window['-DATA MULTILINE-']
     export_button = window['-EXPORT BUTTON-']
+    status_text = window['-STATUS TEXT-']
+    progress_bar = window['-PROGRESS BAR-']
 
     # Event Loop
     ml_enabled = False
+    imported_record = None
+
+    # Set to cancel the job running in the background, or None if there isn't one
+    cancel = None
     while True:
         event, values = window.read()
         if event == sg.WIN_CLOSED or event == 'Exit':
+            if cancel is not None:
+                cancel.set()
             break
 
+        # A background job made progress
+        if event == PROGRESS_EVENT:
+            done, total, message = values[event]
+            status_text.update(value=message)
+            progress_bar.update_bar(done, total)
+
+        # Clicked the 'Cancel' button
+        elif event == '-CANCEL BUTTON-':
+            if cancel is not None:
+                cancel.set()
+                status_text.update(value='Cancelling...')
+
         # Input Path was updated
-        if event == 0:
+        elif event == 0:
             path = values['-INPUT FILEBROWSE-']
-            if not path:
+            if not path or cancel is not None:
                 continue
 
-            record = build_record_from_document(values['-INPUT FILEBROWSE-'])
-            data_multiline.update(value=str(record))
+            cancel = threading.Event()
+            set_busy(window, True)
+            threading.Thread(
+                target=import_worker,
+                args=(window, record_cache, path, cancel),
+                daemon=True
+            ).start()
+
+        # The background import finished
+        elif event == IMPORT_DONE_EVENT:
+            record, error = values[event]
+            cancel = None
+            set_busy(window, False)
+            export_button.update(disabled=not ml_enabled)
+            progress_bar.update_bar(0, 1)
+            if error is not None:
+                status_text.update(value='')
+                sg.Popup(f'Could not import the document: {error}', title='Error')
+                continue
+
+            if record is None:
+                status_text.update(value='Import cancelled')
+                continue
+
+            status_text.update(value='Imported')
+            imported_record = record
+            data_multiline.update(value=str(imported_record))
 
             if not ml_enabled:
                 data_multiline.Widget.configure(wrap='none')
@@ -121,10 +276,40 @@ def handle_window():
                 export_button.update(disabled=False)
                 ml_enabled = True
 
+        # The background export finished
+        elif event == EXPORT_DONE_EVENT:
+            succeeded, error = values[event]
+            cancel = None
+            set_busy(window, False)
+            export_button.update(disabled=False)
+            progress_bar.update_bar(0, 1)
+            if error is not None:
+                status_text.update(value='')
+                sg.Popup(f'Could not export the data: {error}', title='Error')
+                continue
+
+            if not succeeded:
+                status_text.update(value='Export cancelled')
+                continue
+
+            status_text.update(value='Exported')
+            output_folder_path = output_folder_text.get().replace('/', '\\')
+            sp.Popen(f'explorer {output_folder_path}')
+
         # Clicked the 'Export Data' button
         elif event == '-EXPORT BUTTON-':
+            if cancel is not None:
+                continue
+
             output_folder_path = output_folder_text.get()
-            record = build_record_from_string(values['-DATA MULTILINE-'])
+
+            # Only re-parse the displayed text if it was edited after importing
+            data = values['-DATA MULTILINE-']
+            if imported_record is not None and data.rstrip() == str(imported_record).rstrip():
+                record = imported_record
+            else:
+                record = build_record_from_string(data)
+
             if not output_folder_path:
                 sg.Popup('Please select an output folder an try again.',
                          title='Error')
@@ -136,17 +321,20 @@ def handle_window():
                          title='Error')
                 continue
 
-            output_excel_path = output_excel_text.get()
-            if output_excel_path:
-                excel_export(record, optional_xml_path=output_excel_path)
-            else:
-                excel_export(record, export_folder=output_folder_path)
-
-            record_export(record, output_folder_path)
-            word_export(record, output_folder_path)
-
-            output_folder_path = output_folder_path.replace('/', '\\')
-            sp.Popen(f'explorer {output_folder_path}')
+            cancel = threading.Event()
+            set_busy(window, True)
+            threading.Thread(
+                target=export_worker,
+                args=(
+                    window,
+                    record,
+                    output_folder_path,
+                    output_excel_text.get(),
+                    values['-UPSERT CHECKBOX-'],
+                    cancel
+                ),
+                daemon=True
+            ).start()
 
     window.close()
 
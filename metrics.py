@@ -0,0 +1,289 @@
+import functools
+import inspect
+import json
+import threading
+import time
+
+from collections import deque
+from parse import TBC
+from patching import is_wrapped, unwrap_functions, wrap_function
+
+METRIC_PREFIX = 'ndis_parser'
+
+# The most recent call durations kept for each function to calculate percentiles from
+SAMPLE_SIZE = 10000
+
+# The tag the instrumented functions are wrapped with
+PATCH_TAG = 'metrics'
+
+PARSE_FUNCTIONS = ('build_record_from_text',)
+EXPORT_FUNCTIONS = (
+    'word_export', 'word_export_template', 'excel_export', 'excel_export_batch', 'record_export'
+)
+
+
+class FunctionMetrics:
+    __slots__ = ('calls', 'seconds', 'tbc', 'errors', 'samples')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.tbc = 0
+        self.errors = 0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def get_percentile(self, percentile):
+        """Gets a percentile of the recent call durations
+
+        Args:
+            percentile(float): The percentile, from 0 to 100
+
+        Returns:
+            float: The duration in seconds, or 0 if there were no calls
+
+        """
+        if not self.samples:
+            return 0.0
+
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(len(samples) * percentile / 100))]
+
+
+class Metrics:
+    def __init__(self):
+        """The call counts, timings and TBC fallbacks of the instrumented functions"""
+        self.functions = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds, tbc=False, error=False):
+        """Records one call of a function
+
+        Args:
+            name(str): The name of the function
+            seconds(float): How long the call took
+            tbc(bool): Whether the function fell back to TBC (optional)
+            error(bool): Whether the function raised an exception (optional)
+
+        Returns:
+            None
+
+        """
+        with self.lock:
+            function = self.functions.get(name)
+            if function is None:
+                function = self.functions[name] = FunctionMetrics()
+
+            function.calls += 1
+            function.seconds += seconds
+            function.tbc += tbc
+            function.errors += error
+            function.samples.append(seconds)
+
+    def snapshot(self, samples=False):
+        """Gets the metrics of every function
+
+        Args:
+            samples(bool): Whether to include the recent call durations, so the snapshot can be
+                merged into another Metrics object (optional)
+
+        Returns:
+            dict(str, dict): The calls, cumulative seconds, 95th percentile seconds, TBC fallbacks and
+                errors of each function, by name
+
+        """
+        with self.lock:
+            snapshot = {}
+            for name, function in sorted(self.functions.items()):
+                snapshot[name] = {
+                    'calls': function.calls,
+                    'seconds': function.seconds,
+                    'p95_seconds': function.get_percentile(95),
+                    'tbc': function.tbc,
+                    'errors': function.errors
+                }
+                if samples:
+                    snapshot[name]['samples'] = list(function.samples)
+
+            return snapshot
+
+    def merge(self, snapshot):
+        """Adds the metrics of a snapshot, such as one taken in a worker process, to these metrics
+
+        Args:
+            snapshot(dict): A snapshot taken with samples
+
+        Returns:
+            None
+
+        """
+        with self.lock:
+            for name, values in snapshot.items():
+                function = self.functions.get(name)
+                if function is None:
+                    function = self.functions[name] = FunctionMetrics()
+
+                function.calls += values['calls']
+                function.seconds += values['seconds']
+                function.tbc += values['tbc']
+                function.errors += values['errors']
+                function.samples.extend(values.get('samples', ()))
+
+    def take(self):
+        """Takes a snapshot with samples and resets the metrics, so each call only sees new calls
+
+        Returns:
+            dict: The snapshot
+
+        """
+        snapshot = self.snapshot(samples=True)
+        self.reset()
+        return snapshot
+
+    def reset(self):
+        """Forgets every recorded call
+
+        Returns:
+            None
+
+        """
+        with self.lock:
+            self.functions.clear()
+
+    def to_json(self):
+        """Formats the metrics as JSON
+
+        Returns:
+            str: The JSON snapshot
+
+        """
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Formats the metrics in the Prometheus text exposition format
+
+        Returns:
+            str: The metrics
+
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def add_metric(name, metric_type, description, samples):
+            lines.append(f'# HELP {METRIC_PREFIX}_{name} {description}')
+            lines.append(f'# TYPE {METRIC_PREFIX}_{name} {metric_type}')
+            for function, values in snapshot.items():
+                for suffix, labels, key in samples:
+                    labels = f'function="{function}"{labels}'
+                    lines.append(f'{METRIC_PREFIX}_{name}{suffix}{{{labels}}} {values[key]}')
+
+        # The 95th percentile is of recent calls, while the sum and count are of every call
+        add_metric('seconds', 'summary', 'The wall time of calls of each function.', (
+            ('', ',quantile="0.95"', 'p95_seconds'),
+            ('_sum', '', 'seconds'),
+            ('_count', '', 'calls')
+        ))
+        add_metric('tbc_total', 'counter', 'The number of calls of each function that fell back to TBC.',
+                   (('', '', 'tbc'),))
+        add_metric('errors_total', 'counter', 'The number of calls of each function that raised an error.',
+                   (('', '', 'errors'),))
+
+        return '\n'.join(lines) + '\n'
+
+
+# The metrics of the instrumented functions in this process
+metrics = Metrics()
+
+
+def instrument(function, name):
+    """Wraps a function so each call of it is recorded in the metrics
+
+    Args:
+        function(function): The function to wrap
+        name(str): The name to record the function's calls under
+
+    Returns:
+        function: The wrapped function
+
+    """
+    labelled = 'supports_section' in inspect.signature(function).parameters
+
+    # Wrapping keeps the function's module and qualified name, so it can still be pickled by reference
+    # to run on worker processes
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        label = name
+        if labelled:
+            section = kwargs.get('supports_section', args[1] if len(args) > 1 else None)
+            label = f'{name}[{getattr(section, "name", section)}]'
+
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException:
+            metrics.record(label, time.perf_counter() - start, error=True)
+            raise
+
+        metrics.record(label, time.perf_counter() - start, tbc=isinstance(result, str) and result == TBC)
+        return result
+
+    return wrapper
+
+
+def enable(exporters=True):
+    """Instruments the extractors and, optionally, the exporters, which can be done alongside tracing
+
+    Nothing is instrumented until this is called, so there is no overhead while it is switched off
+
+    Args:
+        exporters(bool): Whether to instrument the exporters too, which imports export (optional)
+
+    Returns:
+        None
+
+    """
+    import parse
+
+    modules = [(parse, [name for name in vars(parse) if name.startswith('get_')] + list(PARSE_FUNCTIONS))]
+    if exporters:
+        import export
+
+        modules.append((export, list(EXPORT_FUNCTIONS)))
+
+    for module, names in modules:
+        for name in names:
+            wrap_function(module, name, PATCH_TAG, functools.partial(instrument, name=name))
+
+
+def disable():
+    """Restores the original functions, switching instrumentation off
+
+    Returns:
+        None
+
+    """
+    unwrap_functions(PATCH_TAG)
+
+
+def is_enabled():
+    """Checks whether instrumentation is switched on
+
+    Returns:
+        bool: True if the functions are instrumented, False otherwise
+
+    """
+    return is_wrapped(PATCH_TAG)
+
+
+def write_metrics(path):
+    """Writes the metrics to a file, in the Prometheus text format if its extension is .prom and as
+    JSON otherwise
+
+    Args:
+        path(str): The path of the file
+
+    Returns:
+        None
+
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(metrics.to_prometheus() if path.endswith('.prom') else metrics.to_json())
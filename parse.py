@@ -1,10 +1,21 @@
+from bisect import bisect_left
 from enum import Enum
 from datetime import datetime
-import docx2txt
+from functools import lru_cache
+from xml.etree.ElementTree import XMLPullParser
+import io
 import re
+import sys
+import zipfile
 
+# Change this whenever the extracted data changes, so that cached Records are rebuilt
+PARSER_VERSION = '2'
 NEWLINE = '\n'
 TBC = 'TBC'
+
+# The format Records store dates in
+DATE_FORMAT = '%d/%m/%Y'
+DATE_CACHE_SIZE = 4096
 TITLES_TO_GENDER = {
     'Master': 'Male',
     'Mr': 'Male',
@@ -15,7 +26,79 @@ TITLES_TO_GENDER = {
 }
 PLAN_MANAGED_EMAIL = 'planmanaged@email.com'
 NDIA_MANAGED_EMAIL = 'michelle@lightstreetcare.com.au'
-MAX_32_BIT_INT = 2147483647
+NEWLINE_PATTERN = re.compile(NEWLINE)
+SPACE_PATTERN = re.compile(' ')
+DIGIT_PATTERN = re.compile(r'\d')
+STREET_PATTERN = re.compile('(?:[^ ]* ){2}')
+SUBURB_END_PATTERN = re.compile(r' .* \d{4}$')
+POSTCODE_PATTERN = re.compile(r'\d{4}$')
+POSTCODE_LINE_END_PATTERN = re.compile(r'\d{4}\n')
+TITLE_END_PATTERN = re.compile(r'( |\.)')
+NDIS_PATTERN = re.compile('ndis', re.IGNORECASE)
+FUNDING_FOR_PATTERN = re.compile('funding for', re.IGNORECASE)
+SENTENCE_END_PATTERN = re.compile(r'[a-z]\.', re.IGNORECASE)
+MANAGEMENT_TYPE_PATTERN = re.compile('self-managed|plan-managed|ndia-managed', re.IGNORECASE)
+PLAN_MANAGED_PATTERN = re.compile('plan-managed', re.IGNORECASE)
+BUDGET_PATTERN = re.compile(r'\$.*\.\d{2}\n')
+TOTAL_PATTERN = re.compile(r'\$.*\n[^\$]')
+DOLLAR_PATTERN = re.compile(r'\$')
+FIELD_VALUE_PATTERN = re.compile(':.')
+GOAL_VALUE_PATTERN = re.compile('-.')
+MULTIPLE_SPACES_PATTERN = re.compile(' {2,}')
+MULTIPLE_NEWLINES_PATTERN = re.compile(r'\n{2,}')
+REPEATED_TO_PATTERN = re.compile('to to')
+DOCUMENT_XML_PATH = 'word/document.xml'
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PARAGRAPH_TAG = f'{WORD_NAMESPACE}p'
+TEXT_TAG = f'{WORD_NAMESPACE}t'
+TAB_TAG = f'{WORD_NAMESPACE}tab'
+BREAK_TAGS = (f'{WORD_NAMESPACE}br', f'{WORD_NAMESPACE}cr')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Fields whose values repeat across many Records, so each distinct value is only stored once
+SHARED_FIELDS = frozenset((
+    'title',
+    'gender',
+    'suburb',
+    'state',
+    'postcode',
+    'start_date',
+    'end_date',
+    'categories',
+    'total',
+    'support_coordination_management_type',
+    'support_coordination_hours',
+    'funded_supports_total',
+    'additional_email_address',
+    'service_region_id'
+))
+ANCHORS = {
+    'title': ('reference', r'reference.*\n'),
+    'address': ('reference', 'reference.*'),
+    'full_name': ('name: ', None),
+    'dob': ('date of birth', None),
+    'ndis_number': ('ndis number: ', None),
+    'plan_start_date': ('start date: ', None),
+    'plan_end_date': ('review due date: ', None),
+    'home_phone_number': ('home number: ', None),
+    'mobile_phone_number': ('mobile: ', None),
+    'email_address': ('preferred contact method', r'preferred contact method.*email\n'),
+    'support_coordination': ('support coordination', None),
+    'core_supports': ('core supports', None),
+    'capacity_building_supports': ('capacity building supports', None),
+    'capital_supports': ('capital supports', None),
+    'core_supports_goals': ('goal/s my core supports', None),
+    'capacity_building_supports_goals': ('goal/s my capacity building supports', None),
+    'capital_supports_goals': ('goal/s my capital supports', None),
+    'core_supports_total': ('total core supports', None),
+    'capacity_building_supports_total': ('total capacity building supports', None),
+    'capital_supports_total': ('total capital supports', None),
+    'funded_supports_total': ('total funded supports', None)
+}
+ANCHOR_PATTERNS = {
+    name: (literal, re.compile(regex or re.escape(literal), re.IGNORECASE))
+    for name, (literal, regex) in ANCHORS.items()
+}
 
 
 class SupportsType(Enum):
@@ -24,31 +107,251 @@ class SupportsType(Enum):
     CAPITAL = 3
 
 
+SUPPORTS_CATEGORIES = {
+    SupportsType.CORE: (
+        'Assistance with Daily Life',
+        'Transport',
+        'Consumables',
+        'Assistance with Social, Economic and Community Participation'
+    ),
+    SupportsType.CAPACITY_BUILDING: (
+        'Support Coordination',
+        'Improved Living Arrangements',
+        'Increased Social and Community Participation',
+        'Finding and Keeping a Job',
+        'Improved Relationships',
+        'Improved Health and Wellbeing',
+        'Improved Learning',
+        'Improved Life Choices',
+        'Improved Daily Living'
+    ),
+    SupportsType.CAPITAL: (
+        'Assistive Technology',
+        'Home Modifications and Specialist Disability Accommodation'
+    )
+}
+SUPPORTS_SECTION_ANCHORS = {
+    SupportsType.CORE: 'core_supports',
+    SupportsType.CAPACITY_BUILDING: 'capacity_building_supports',
+    SupportsType.CAPITAL: 'capital_supports'
+}
+SUPPORTS_GOALS_ANCHORS = {
+    SupportsType.CORE: 'core_supports_goals',
+    SupportsType.CAPACITY_BUILDING: 'capacity_building_supports_goals',
+    SupportsType.CAPITAL: 'capital_supports_goals'
+}
+SECTION_HEADING_ANCHORS = (
+    'core_supports',
+    'capacity_building_supports',
+    'capital_supports',
+    'funded_supports_total'
+)
+
+# Section headings only count where they start a line, unlike the same words inside a sentence
+HEADING_PATTERNS = {
+    name: re.compile('^' + re.escape(ANCHORS[name][0]), re.IGNORECASE | re.MULTILINE)
+    for name in SECTION_HEADING_ANCHORS
+}
+ALL_CATEGORIES = tuple(
+    category for categories in SUPPORTS_CATEGORIES.values() for category in categories
+)
+
+# One group per category, so the group index of a match identifies the category
+CATEGORY_PATTERN = re.compile(
+    '(?:' + '|'.join(f'({re.escape(category)})' for category in ALL_CATEGORIES) + r')(?!.*\.)',
+    re.IGNORECASE
+)
+
+
+class Anchors:
+    def __init__(self, document):
+        self.document = document
+        self.spans = {}
+        self.headings = {}
+        self.sections = None
+        self.located_categories = None
+
+        # Each anchor is found with its own str.find over a lowercase copy, the first time it is
+        # needed, rather than in one pass with a combined pattern. CPython's re tries every branch
+        # of an alternation at every position, which made one combined pass about 60x slower than
+        # the separate substring searches. Plain substring searches can only stand in for
+        # case-insensitive regex searches while lowercasing doesn't change any offsets
+        lowered = document.lower()
+        self.lowered = lowered if len(lowered) == len(document) else None
+
+    def span(self, name, bounds=None):
+        """Gets the start and end indicies of the first occurrence of an anchor in the document
+
+        Args:
+            name (str): The name of an anchor in ANCHORS
+            bounds ((int, int)): The start and end index of the part of the document to search,
+                or None to search the whole document (optional)
+
+        Returns:
+            (int, int): A 2-tuple containing the start and end index of the anchor,
+                or None if the anchor couldn't be found
+
+        """
+        key = (name, bounds)
+        if key in self.spans:
+            return self.spans[key]
+
+        start, end = bounds or (0, len(self.document))
+        literal, pattern = ANCHOR_PATTERNS[name]
+        if self.lowered is None:
+            span = index(self.document, pattern, start, end)
+        else:
+            span = None
+            start = self.lowered.find(literal, start, end)
+            while start != -1:
+                # The pattern starts with the literal, so it can only match where the literal does
+                span = match_index(self.document, pattern, start, end)
+                if span is not None:
+                    break
+
+                start = self.lowered.find(literal, start + 1, end)
+
+        self.spans[key] = span
+        return span
+
+    def heading_starts(self, name):
+        """Gets the start indicies of every line that starts with a section heading
+
+        Args:
+            name (str): The name of an anchor in SECTION_HEADING_ANCHORS
+
+        Returns:
+            list(int): The start indicies, in document order
+
+        """
+        if name not in self.headings:
+            self.headings[name] = [match.start() for match in HEADING_PATTERNS[name].finditer(self.document)]
+
+        return self.headings[name]
+
+    def section(self, supports_section):
+        """Gets the bounds of a supports section, from its heading up to the next section heading
+
+        Plans may summarise their funding under the same headings before the supports sections, so
+        a section is found from its goals, which only appear in the section itself. It starts at the
+        last line starting with its heading before its goals, and ends at the first line starting
+        with another section's heading after its goals
+
+        Args:
+            supports_section (SupportsType): The supports section to get the bounds of
+
+        Returns:
+            (int, int): A 2-tuple containing the start and end index of the section,
+                or None if the section heading couldn't be found
+
+        """
+        if self.sections is None:
+            goals_spans = {
+                section: self.span(anchor_name) for section, anchor_name in SUPPORTS_GOALS_ANCHORS.items()
+            }
+            first_goals_start = min((span[0] for span in goals_spans.values() if span is not None), default=0)
+
+            self.sections = {}
+            for section, anchor_name in SUPPORTS_SECTION_ANCHORS.items():
+                heading_starts = self.heading_starts(anchor_name)
+                goals_span = goals_spans[section]
+                if goals_span is not None:
+                    i = bisect_left(heading_starts, goals_span[0])
+                    start = heading_starts[i - 1] if i else self.document.rfind(NEWLINE, 0, goals_span[0]) + 1
+                    after = goals_span[1]
+                else:
+                    # Without goals, skip any headings in a summary before the first section's goals
+                    i = bisect_left(heading_starts, first_goals_start)
+                    if i == len(heading_starts):
+                        continue
+
+                    start = after = heading_starts[i]
+
+                ends = []
+                for other_name in SECTION_HEADING_ANCHORS:
+                    if other_name == anchor_name:
+                        continue
+
+                    other_starts = self.heading_starts(other_name)
+                    i = bisect_left(other_starts, after + 1)
+                    if i < len(other_starts):
+                        ends.append(other_starts[i])
+
+                self.sections[section] = (start, min(ends, default=len(self.document)))
+
+        return self.sections.get(supports_section)
+
+    def categories(self, supports_section):
+        """Gets the supports categories that follow a supports section heading, in document order
+
+        Every category of every supports section is found in a single pass over the document,
+        and only categories inside a section's bounds belong to it
+
+        Args:
+            supports_section (SupportsType): The supports section to get the categories of
+
+        Returns:
+            tuple(str): The categories in the order they first appear in the section, or None if the
+                section heading couldn't be found
+
+        """
+        if self.located_categories is None:
+            section_bounds = {}
+            for section in SUPPORTS_SECTION_ANCHORS:
+                bounds = self.section(section)
+                if bounds is not None:
+                    section_bounds[section] = bounds
+
+            # Record every position each category appears at within the supports sections
+            positions = {category: [] for category in ALL_CATEGORIES}
+            if section_bounds:
+                start = min(bounds[0] for bounds in section_bounds.values())
+                end = max(bounds[1] for bounds in section_bounds.values())
+                for match in CATEGORY_PATTERN.finditer(self.document, start, end):
+                    positions[ALL_CATEGORIES[match.lastindex - 1]].append(match.start())
+
+            # Order each section's categories by their first position after its heading
+            self.located_categories = {}
+            for section, (start, end) in section_bounds.items():
+                firsts = []
+                for category in SUPPORTS_CATEGORIES[section]:
+                    category_positions = positions[category]
+                    i = bisect_left(category_positions, start)
+                    if i < len(category_positions) and category_positions[i] < end:
+                        firsts.append((category_positions[i], category))
+
+                self.located_categories[section] = tuple(category for _, category in sorted(firsts))
+
+        return self.located_categories.get(supports_section)
+
+
 class Location:
+    __slots__ = ('house_number', 'street', 'suburb', 'state', 'postcode')
+
     def __init__(self, address):
         try:
             # Get the house number
-            end = index(address, ' ')[0]
+            end = index(address, SPACE_PATTERN)[0]
             self.house_number = address[:end]
 
             # Get the street
             start = end + 1
-            end = index(address, '^(?:[^ ]* ){2}', start)[1] - 1
+            end = match_index(address, STREET_PATTERN, start)[1] - 1
             self.street = address[start:end].title()
 
             # Get the suburb
             start = end + 1
-            end = index(address, r' .* \d{4}$', start)[0]
-            self.suburb = address[start:end].title()
+            end = index(address, SUBURB_END_PATTERN, start)[0]
+            self.suburb = share(address[start:end].title())
 
             # Get the state
             start = end + 1
-            end = index(address, ' ', start)[0]
-            self.state = address[start:end].upper()
+            end = index(address, SPACE_PATTERN, start)[0]
+            self.state = share(address[start:end].upper())
 
             # Get the postcode
-            start = index(address, r'\d{4}$')[0]
-            self.postcode = address[start:]
+            start = index(address, POSTCODE_PATTERN)[0]
+            self.postcode = share(address[start:])
         except TypeError:
             self.house_number = ''
             self.street = ''
@@ -67,6 +370,20 @@ class Location:
 
 
 class Client:
+    __slots__ = (
+        'title',
+        'full_name',
+        'first_name',
+        'last_name',
+        'gender',
+        'dob',
+        'address',
+        'home_phone_number',
+        'mobile_phone_number',
+        'email_address',
+        'ndis_number'
+    )
+
     def __init__(self,
                  title,
                  full_name,
@@ -77,9 +394,9 @@ class Client:
                  mobile_phone_number,
                  email_address,
                  ndis_number):
-        self.title = title
+        self.title = share(title)
         self.full_name = full_name
-        self.gender = gender
+        self.gender = share(gender)
         self.dob = dob
         self.address = address
         self.home_phone_number = home_phone_number
@@ -88,7 +405,7 @@ class Client:
         self.ndis_number = ndis_number
 
         # Get the first name
-        end = index(full_name, ' ')[0]
+        end = index(full_name, SPACE_PATTERN)[0]
         self.first_name = full_name[:end]
 
         # Get the last name
@@ -97,19 +414,34 @@ class Client:
 
 
 class Plan:
+    __slots__ = ('start_date', 'end_date')
+
     def __init__(self, start_date, end_date):
-        self.start_date = start_date
-        self.end_date = end_date
+        self.start_date = share(start_date)
+        self.end_date = share(end_date)
 
 
 class Supports:
+    __slots__ = ('goals', 'categories', 'total')
+
     def __init__(self, goals, categories, total):
         self.goals = goals
-        self.categories = categories
-        self.total = total
+        self.categories = share(categories)
+        self.total = share(total)
 
 
 class Record:
+    __slots__ = (
+        'client',
+        'plan',
+        'supports',
+        'support_coordination_management_type',
+        'support_coordination_hours',
+        'funded_supports_total',
+        'additional_email_address',
+        'service_region_id'
+    )
+
     def __init__(self,
                  client,
                  plan,
@@ -122,11 +454,11 @@ class Record:
         self.client = client
         self.plan = plan
         self.supports = supports
-        self.support_coordination_management_type = support_coordination_management_type
-        self.support_coordination_hours = support_coordination_hours
-        self.funded_supports_total = funded_supports_total
-        self.additional_email_address = additional_email_address
-        self.service_region_id = service_region_id
+        self.support_coordination_management_type = share(support_coordination_management_type)
+        self.support_coordination_hours = share(support_coordination_hours)
+        self.funded_supports_total = share(funded_supports_total)
+        self.additional_email_address = share(additional_email_address)
+        self.service_region_id = share(service_region_id)
 
     def __str__(self):
         string = (
@@ -195,42 +527,170 @@ def clean_document(document):
         str: The cleaned document
 
     """
-    doc = re.sub(' {2,}', ' ', document)
-    doc = re.sub(r'\n{2,}', r'\n', doc)
-    doc = re.sub('to to', 'to', doc)
+    doc = MULTIPLE_SPACES_PATTERN.sub(' ', document)
+    doc = MULTIPLE_NEWLINES_PATTERN.sub(NEWLINE, doc)
+    doc = REPEATED_TO_PATTERN.sub('to', doc)
 
     return doc
 
 
-def get_document(path):
+def stream_document(file):
+    """Streams the text of a word document's body out of its zip, cleaning it as it is emitted
+
+    Only word/document.xml is inflated, so headers, footers and embedded media are never loaded.
+    The text is laid out the same way docx2txt lays it out and cleaned the same way
+    clean_document cleans it
+
+    Args:
+        file (str): The path to a word document, or a binary file object containing one
+
+    Returns:
+        str: The cleaned contents of the word document
+
+    """
+    pieces = []
+    paragraph = []
+
+    def emit():
+        text = ''.join(paragraph)
+        paragraph.clear()
+
+        # Collapse runs of spaces and newlines, including runs that continue from the last piece
+        text = MULTIPLE_SPACES_PATTERN.sub(' ', text)
+        text = MULTIPLE_NEWLINES_PATTERN.sub(NEWLINE, text)
+        if not pieces:
+            text = text.lstrip()
+        elif text and text[0] in ' \n' and pieces[-1][-1] == text[0]:
+            text = text.lstrip(text[0])
+
+        if text:
+            pieces.append(text)
+
+    parser = XMLPullParser(events=('start', 'end'))
+    with zipfile.ZipFile(file) as docx, docx.open(DOCUMENT_XML_PATH) as xml:
+        for chunk in iter(lambda: xml.read(STREAM_CHUNK_SIZE), b''):
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    if element.tag == PARAGRAPH_TAG:
+                        emit()
+                        paragraph.append('\n\n')
+                    elif element.tag == TAB_TAG:
+                        paragraph.append('\t')
+                    elif element.tag in BREAK_TAGS:
+                        paragraph.append(NEWLINE)
+                else:
+                    if element.tag == TEXT_TAG and element.text is not None:
+                        paragraph.append(element.text)
+
+                    # Drop the contents of each element once it has been read to keep memory bounded
+                    element.clear()
+
+        parser.close()
+
+    emit()
+    return ''.join(pieces).rstrip().replace('to to', 'to')
+
+
+def get_document(path, streaming=True):
     """Gets the contents of a word document
 
     Args:
         path (str): The path to a word document
+        streaming (bool): Whether to stream only the body of the document, instead of extracting
+            the headers and footers as well with docx2txt (optional)
 
     Returns:
         str: The contents of the word document
 
     """
+    if streaming:
+        return stream_document(path)
+
+    # Imported on first use, since streaming, which is the default, doesn't need it
+    import docx2txt
+
     return clean_document(docx2txt.process(path))
 
 
-def index(string, regex, start=0):
+@lru_cache(maxsize=None)
+def compile_regex(regex):
+    """Compiles a case-insensitive regex pattern, reusing it if it has been compiled before
+
+    Args:
+        regex (str): The regex pattern to compile
+
+    Returns:
+        re.Pattern: The compiled regex pattern
+
+    """
+    return re.compile(regex, re.IGNORECASE)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(date):
+    """Converts a date the way Records store them into an ISO 8601 date, which sorts and compares
+    correctly as text
+
+    Dates repeat across many plans, so each distinct one is only converted once
+
+    Args:
+        date (str): The date, as dd/mm/yyyy
+
+    Returns:
+        str: The date as yyyy-mm-dd, or None if it is 'TBC' or isn't a date
+
+    """
+    try:
+        return datetime.strptime(date, DATE_FORMAT).date().isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def index(string, pattern, start=0, end=None):
     """Get the start and end indicies of a found regex pattern in a string
 
     Args:
         string (str): The The contents of a document
-        regex (str): The regex pattern to search for
+        pattern (re.Pattern): The compiled regex pattern to search for. A regex string is
+            compiled case-insensitively
         start (int): The index to start the search from (optional)
+        end (int): The index to stop the search at, or None to search to the end (optional)
 
     Returns:
         (int, int): A 2-tuple containing the start and end index of the text found in a string
             that matches the regex pattern, or None if the regex pattern couldn't be found
 
     """
-    match = re.search(regex, string[start:], re.IGNORECASE)
+    if isinstance(pattern, str):
+        pattern = compile_regex(pattern)
+
+    match = pattern.search(string, start, len(string) if end is None else end)
+    if match is not None:
+        return match.span()
+
+
+def match_index(string, pattern, start=0, end=None):
+    """Get the start and end indicies of a regex pattern that matches a string at an index
+
+    Args:
+        string (str): The The contents of a document
+        pattern (re.Pattern): The compiled regex pattern to match. A regex string is
+            compiled case-insensitively
+        start (int): The index the match must start at (optional)
+        end (int): The index the match must end by, or None to allow any end (optional)
+
+    Returns:
+        (int, int): A 2-tuple containing the start and end index of the matched text,
+            or None if the regex pattern doesn't match at the index
+
+    """
+    if isinstance(pattern, str):
+        pattern = compile_regex(pattern)
+
+    match = pattern.match(string, start, len(string) if end is None else end)
     if match is not None:
-        return tuple(index + start for index in match.span())
+        return match.span()
 
 
 def clean_string(string):
@@ -246,279 +706,347 @@ def clean_string(string):
     return ' '.join(string.split())
 
 
-def get_title(document):
+def share(value):
+    """Gets the single shared copy of a commonly repeated value, so that large batches of Records
+    don't store the same string many times over
+
+    Args:
+        value (str or tuple): The value to share. Tuples are shared element by element
+
+    Returns:
+        str or tuple: The shared copy of the value, or the value itself if it isn't a string or tuple
+
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+
+    if isinstance(value, tuple):
+        return tuple(share(item) for item in value)
+
+    return value
+
+
+def get_title(document, anchors=None):
     """Extracts a title out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted title, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, r'reference.*\n')[1]
-        end = index(document, r'( |\.)', start)[0]
+        start = anchors.span('title')[1]
+        end = index(document, TITLE_END_PATTERN, start)[0]
     except TypeError:
         return TBC
 
     return clean_string(document[start:end])
 
 
-def get_full_name(document):
+def get_full_name(document, anchors=None):
     """Extracts a full name out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted full name, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'name: ')[1]
-        end = index(document, 'ndis', start)[0]
+        start = anchors.span('full_name')[1]
+        end = index(document, NDIS_PATTERN, start)[0]
     except TypeError:
         return TBC
 
     return clean_string(document[start:end]).title()
 
 
-def get_dob(document):
+def get_dob(document, anchors=None):
     """Extracts a date of birth out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted date of birth, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'date of birth')[1]
-        start = index(document, r'\d', start)[0]
-        end = index(document, NEWLINE, start)[0]
+        start = anchors.span('dob')[1]
+        start = index(document, DIGIT_PATTERN, start)[0]
+        end = index(document, NEWLINE_PATTERN, start)[0]
     except TypeError:
         return TBC
 
-    return datetime.strptime(clean_string(document[start:end]), '%d %B %Y').strftime('%d/%m/%Y')
+    return datetime.strptime(clean_string(document[start:end]), '%d %B %Y').strftime(DATE_FORMAT)
 
 
-def get_address(document):
+def get_address(document, anchors=None):
     """Extracts an address out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted address, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'reference.*')[1]
-        start = index(document, r'\d', start)[0]
-        end = index(document, r'\d{4}\n', start)[1]
+        start = anchors.span('address')[1]
+        start = index(document, DIGIT_PATTERN, start)[0]
+        end = index(document, POSTCODE_LINE_END_PATTERN, start)[1]
     except TypeError:
         return TBC
 
     return clean_string(document[start:end])
 
 
-def get_ndis_number(document):
+def get_ndis_number(document, anchors=None):
     """Extracts an NDIS number out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted NDIS number, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'ndis number: ')[1]
-        end = index(document, NEWLINE, start)[0]
+        start = anchors.span('ndis_number')[1]
+        end = index(document, NEWLINE_PATTERN, start)[0]
     except TypeError:
         return TBC
 
     return clean_string(document[start:end])
 
 
-def get_plan_start_date(document):
+def get_plan_start_date(document, anchors=None):
     """Extracts a plan start date out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted plan start date, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'start date: ')[1]
-        end = index(document, 'ndis', start)[0]
+        start = anchors.span('plan_start_date')[1]
+        end = index(document, NDIS_PATTERN, start)[0]
     except TypeError:
         return TBC
 
-    return datetime.strptime(clean_string(document[start:end]), '%d %B %Y').strftime('%d/%m/%Y')
+    return datetime.strptime(clean_string(document[start:end]), '%d %B %Y').strftime(DATE_FORMAT)
 
 
-def get_plan_end_date(document):
+def get_plan_end_date(document, anchors=None):
     """Extracts a plan end date out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted plan end date, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'review due date: ')[1]
-        end = index(document, NEWLINE, start)[0]
+        start = anchors.span('plan_end_date')[1]
+        end = index(document, NEWLINE_PATTERN, start)[0]
     except TypeError:
         return TBC
 
-    return datetime.strptime(clean_string(document[start:end]), '%d %B %Y').strftime('%d/%m/%Y')
+    return datetime.strptime(clean_string(document[start:end]), '%d %B %Y').strftime(DATE_FORMAT)
 
 
-def get_home_phone_number(document):
+def get_home_phone_number(document, anchors=None):
     """Extracts a home phone number out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted home phone number, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'home number: ')[1]
-        end = index(document, NEWLINE, start)[0]
+        start = anchors.span('home_phone_number')[1]
+        end = index(document, NEWLINE_PATTERN, start)[0]
     except TypeError:
         return TBC
 
     return clean_string(document[start:end])
 
 
-def get_mobile_phone_number(document):
+def get_mobile_phone_number(document, anchors=None):
     """Extracts a mobile phone number out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted mobile phone number, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'mobile: ')[1]
-        end = index(document, NEWLINE, start)[0]
+        start = anchors.span('mobile_phone_number')[1]
+        end = index(document, NEWLINE_PATTERN, start)[0]
     except TypeError:
         return TBC
 
     return clean_string(document[start:end])
 
 
-def get_email_address(document):
+def get_email_address(document, anchors=None):
     """Extracts an email address out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted email address, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, r'preferred contact method.*email\n')[1]
-        end = index(document, NEWLINE, start)[0]
+        start = anchors.span('email_address')[1]
+        end = index(document, NEWLINE_PATTERN, start)[0]
     except TypeError:
         return TBC
 
     return clean_string(document[start:end])
 
 
-def get_core_supports_included_funding(document):
+def get_core_supports_included_funding(document, anchors=None):
     """Extracts the core supports included funding out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted core supports included funding, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'core supports')[0]
-        start = index(document, 'funding for', start)[0]
-        end = index(document, r'[a-z]\.', start)[1] + 1
+        start, section_end = anchors.section(SupportsType.CORE)
+        start = index(document, FUNDING_FOR_PATTERN, start, section_end)[0]
+        end = index(document, SENTENCE_END_PATTERN, start, section_end)[1] + 1
     except TypeError:
         return TBC
 
     return clean_string(document[start:end])
 
 
-def get_support_coordination_management_type(document):
+def get_support_coordination_management_type(document, anchors=None):
     """Extracts the support coordination management type out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted support coordination management type, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'support coordination')[1]
-        start = index(document, 'self-managed|plan-managed|ndia-managed', start)[0]
-        end = index(document, NEWLINE, start)[0]
+        start = anchors.span('support_coordination')[1]
+        start = index(document, MANAGEMENT_TYPE_PATTERN, start)[0]
+        end = index(document, NEWLINE_PATTERN, start)[0]
     except TypeError:
         return TBC
 
     return clean_string(document[start:end])
 
 
-def get_supports_goals(document, supports_section):
+def get_supports_goals(document, supports_section, anchors=None):
     """Extracts supports goals out of a document
 
     Args:
         document (str): The contents of a document
         supports_section (SupportsType): The supports category to search for goals
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         tuple(str): The extracted supports goals, or 'TBC' if none could be found
 
     """
     if supports_section == SupportsType.CORE:
-        regex_strings = (
-            'goal/s my core supports',
-            'core supports'
-        )
+        end_string = 'core supports'
     elif supports_section == SupportsType.CAPACITY_BUILDING:
-        regex_strings = (
-            'goal/s my capacity building supports',
-            'capacity building funding'
-        )
+        end_string = 'capacity building funding'
     elif supports_section == SupportsType.CAPITAL:
-        regex_strings = (
-            'goal/s my capital supports',
-            'capital supports funding'
-        )
+        end_string = 'capital supports funding'
     else:
         return
 
+    anchor_name = SUPPORTS_GOALS_ANCHORS[supports_section]
+
+    if anchors is None:
+        anchors = Anchors(document)
+
     goals = []
     try:
-        start = index(document, regex_strings[0])[0]
-        start = index(document, NEWLINE, start)[0] + 1
-        end = index(document, NEWLINE, start)[0]
+        bounds = anchors.section(supports_section)
+        section_end = bounds[1]
+
+        start = anchors.span(anchor_name, bounds)[0]
+        start = index(document, NEWLINE_PATTERN, start, section_end)[0] + 1
+        end = index(document, NEWLINE_PATTERN, start, section_end)[0]
 
         goal = document[start:end]
-        while regex_strings[1] not in goal.lower():
+        while end_string not in goal.lower():
             goals.append(goal)
 
             start = end + 1
-            end = index(document, NEWLINE, start)[0]
+            end = index(document, NEWLINE_PATTERN, start, section_end)[0]
             goal = document[start:end]
     except TypeError:
         return TBC
@@ -526,79 +1054,40 @@ def get_supports_goals(document, supports_section):
     return tuple(goals)
 
 
-def get_supports_categories(document, supports_section):
+def get_supports_categories(document, supports_section, anchors=None):
     """Extracts supports categories and their budgets out of a document
 
     Args:
         document (str): The contents of a document
         supports_section (SupportsType): The supports section to search for supports
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         tuple(tuple(str, str)): The extracted supports categories and their budgets,
             or 'TBC' if none could be found
 
     """
-    budget_regex = r'\$.*\.\d{2}\n'
-    if supports_section == SupportsType.CORE:
-        categories_to_budgets = [['Core']]
-        categories = [
-            'Assistance with Daily Life',
-            'Transport',
-            'Consumables',
-            'Assistance with Social, Economic and Community Participation'
-        ]
-        regex_string = 'core supports'
-    elif supports_section == SupportsType.CAPACITY_BUILDING:
-        categories_to_budgets = []
-        categories = [
-            'Support Coordination',
-            'Improved Living Arrangements',
-            'Increased Social and Community Participation',
-            'Finding and Keeping a Job',
-            'Improved Relationships',
-            'Improved Health and Wellbeing',
-            'Improved Learning',
-            'Improved Life Choices',
-            'Improved Daily Living'
-        ]
-        regex_string = 'capacity building supports'
-    elif supports_section == SupportsType.CAPITAL:
-        categories_to_budgets = []
-        categories = [
-            'Assistive Technology',
-            'Home Modifications and Specialist Disability Accommodation'
-        ]
-        regex_string = 'capital supports'
-    else:
+    if supports_section not in SUPPORTS_CATEGORIES:
         return
 
+    if anchors is None:
+        anchors = Anchors(document)
+
+    categories_to_budgets = [['Core']] if supports_section == SupportsType.CORE else []
     try:
-        category_start = index(document, regex_string)[1]
-
-        # Get all the applicable core supports categories
-        for i in range(len(categories)):
-            lowest_index = MAX_32_BIT_INT
-            curr_category = None
-            for category in categories:
-                curr_indices = index(document, category + r'(?!.*\.)', category_start)
-                if curr_indices is None:
-                    continue
-
-                # Find the closest category in the document
-                if curr_indices[0] < lowest_index:
-                    lowest_index = curr_indices[0]
-                    curr_category = category
-
-            # Add the correct category to the list, if possible
-            if curr_category is not None:
-                categories_to_budgets.append([curr_category])
-                categories.pop(categories.index(curr_category))
+        category_start, section_end = anchors.section(supports_section)
+
+        # Get all the applicable supports categories, of which the core supports have at least its
+        # flexible budget
+        categories_to_budgets.extend([category] for category in anchors.categories(supports_section))
+        if not categories_to_budgets:
+            return TBC
 
         # Add budgets to the list for each category
-        indices = index(document, budget_regex, category_start)
+        indices = index(document, BUDGET_PATTERN, category_start, section_end)
         for i in range(len(categories_to_budgets)):
             categories_to_budgets[i].append(document[indices[0]:indices[1] - 1])
-            indices = index(document, budget_regex, indices[1])
+            indices = index(document, BUDGET_PATTERN, indices[1], section_end)
 
     except TypeError:
         return TBC
@@ -606,50 +1095,61 @@ def get_supports_categories(document, supports_section):
     return tuple(tuple(elem) for elem in categories_to_budgets)
 
 
-def get_supports_total(document, supports_section):
+def get_supports_total(document, supports_section, anchors=None):
     """Extracts supports total budgets from a document
 
     Args:
         document (str): The contents of a document
         supports_section (SupportsType): The supports section to get the total budget from
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted supports toal budget, or 'TBC' if it could not be found
 
     """
     if supports_section == SupportsType.CORE:
-        regex_string = 'total core supports'
+        anchor_name = 'core_supports_total'
     elif supports_section == SupportsType.CAPACITY_BUILDING:
-        regex_string = 'total capacity building supports'
+        anchor_name = 'capacity_building_supports_total'
     elif supports_section == SupportsType.CAPITAL:
-        regex_string = 'total capital supports'
+        anchor_name = 'capital_supports_total'
     else:
         return
 
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, regex_string)[0]
-        start = index(document, r'\$.*\n[^\$]', start)[0]
-        end = index(document, NEWLINE, start)[0]
+        bounds = anchors.section(supports_section)
+        start = anchors.span(anchor_name, bounds)[0]
+
+        # Let the pattern look at the first character after the section to see where the total ends
+        start = index(document, TOTAL_PATTERN, start, bounds[1] + 1)[0]
+        end = index(document, NEWLINE_PATTERN, start, bounds[1])[0]
     except TypeError:
         return TBC
 
     return clean_string(document[start:end])
 
 
-def get_funded_supports_total(document):
+def get_funded_supports_total(document, anchors=None):
     """Extracts a plan start date out of a document
 
     Args:
         document (str): The contents of a document
+        anchors (Anchors): The anchors of the document, if they have already been found (optional)
 
     Returns:
         str: The extracted plan start date, or 'TBC' if it could not be found
 
     """
+    if anchors is None:
+        anchors = Anchors(document)
+
     try:
-        start = index(document, 'total funded supports')[0]
-        start = index(document, r'\$', start)[0]
-        end = index(document, NEWLINE, start)[0]
+        start = anchors.span('funded_supports_total')[0]
+        start = index(document, DOLLAR_PATTERN, start)[0]
+        end = index(document, NEWLINE_PATTERN, start)[0]
     except TypeError:
         return TBC
 
@@ -666,60 +1166,86 @@ def build_record_from_document(path):
         Record: The built Record object
 
     """
-    # Get the contents of the word document
-    document = get_document(path)
+    return build_record_from_text(get_document(path))
+
+
+def build_record_from_bytes(data):
+    """Build a Record object from a word document that has already been read into memory
+
+    Args:
+        data (bytes): The contents of a word document
+
+    Returns:
+        Record: The built Record object
+
+    """
+    return build_record_from_text(stream_document(io.BytesIO(data)))
+
+
+def build_record_from_text(document):
+    """Build a Record object from the contents of a document
+
+    Args:
+        document (str): The cleaned contents of a word document, as returned by get_document
+
+    Returns:
+        Record: The built Record object
+
+    """
+    # Find where each piece of data starts, once for all of the extractors
+    anchors = Anchors(document)
 
     # Get address by building a Location object
-    address = Location(get_address(document))
+    address = Location(get_address(document, anchors=anchors))
 
     # Build a Client object
-    title = get_title(document)
+    title = get_title(document, anchors=anchors)
     client = Client(
         title,
-        get_full_name(document),
+        get_full_name(document, anchors=anchors),
         TITLES_TO_GENDER.get(title),
-        get_dob(document),
+        get_dob(document, anchors=anchors),
         address,
-        get_home_phone_number(document),
-        get_mobile_phone_number(document),
-        get_email_address(document),
-        get_ndis_number(document)
+        get_home_phone_number(document, anchors=anchors),
+        get_mobile_phone_number(document, anchors=anchors),
+        get_email_address(document, anchors=anchors),
+        get_ndis_number(document, anchors=anchors)
     )
 
     # Build a Plan object
-    plan = Plan(get_plan_start_date(document), get_plan_end_date(document))
+    plan = Plan(get_plan_start_date(document, anchors=anchors), get_plan_end_date(document, anchors=anchors))
 
     # Build a supports dictionary
     supports = {
         'Core': Supports(
-            get_supports_goals(document, SupportsType.CORE),
-            get_supports_categories(document, SupportsType.CORE),
-            get_supports_total(document, SupportsType.CORE)
+            get_supports_goals(document, SupportsType.CORE, anchors=anchors),
+            get_supports_categories(document, SupportsType.CORE, anchors=anchors),
+            get_supports_total(document, SupportsType.CORE, anchors=anchors)
         ),
 
         'Capacity Building': Supports(
-            get_supports_goals(document, SupportsType.CAPACITY_BUILDING),
-            get_supports_categories(document, SupportsType.CAPACITY_BUILDING),
-            get_supports_total(document, SupportsType.CAPACITY_BUILDING)
+            get_supports_goals(document, SupportsType.CAPACITY_BUILDING, anchors=anchors),
+            get_supports_categories(document, SupportsType.CAPACITY_BUILDING, anchors=anchors),
+            get_supports_total(document, SupportsType.CAPACITY_BUILDING, anchors=anchors)
         ),
 
         'Capital': Supports(
-            get_supports_goals(document, SupportsType.CAPITAL),
-            get_supports_categories(document, SupportsType.CAPITAL),
-            get_supports_total(document, SupportsType.CAPITAL)
+            get_supports_goals(document, SupportsType.CAPITAL, anchors=anchors),
+            get_supports_categories(document, SupportsType.CAPITAL, anchors=anchors),
+            get_supports_total(document, SupportsType.CAPITAL, anchors=anchors)
         )
     }
 
     # Get the funded supports total
-    funded_supports_total = get_funded_supports_total(document)
+    funded_supports_total = get_funded_supports_total(document, anchors=anchors)
 
     # Get the support coordination management type
-    support_coordination_management = get_support_coordination_management_type(document)
+    support_coordination_management = get_support_coordination_management_type(document, anchors=anchors)
 
     # Get the additional email address
     additional_email_address = (
         PLAN_MANAGED_EMAIL
-        if index(support_coordination_management, 'plan-managed') is not None
+        if index(support_coordination_management, PLAN_MANAGED_PATTERN) is not None
         else NDIA_MANAGED_EMAIL
     )
 
@@ -754,7 +1280,7 @@ def build_record_from_string(string):
         # The indices for lines that have constant formatting (i.e. not lists that change size)
         const_indices = list(range(1, 11))
         const_indices.extend([13, 14])
-        const_data = [lines[i][index(lines[i], ':.')[1]:].strip() for i in const_indices]
+        const_data = [lines[i][index(lines[i], FIELD_VALUE_PATTERN)[1]:].strip() for i in const_indices]
 
         # Line number to start on for supports data
         line_index = 18
@@ -773,7 +1299,7 @@ def build_record_from_string(string):
                 # Get goals
                 goals = []
                 while '-' in curr_line:
-                    goals.append(curr_line[index(curr_line, '-.')[1]:].strip())
+                    goals.append(curr_line[index(curr_line, GOAL_VALUE_PATTERN)[1]:].strip())
                     line_index += 1
                     curr_line = lines[line_index]
 
@@ -788,7 +1314,7 @@ def build_record_from_string(string):
                 # Get categories
                 categories = []
                 while 'total' not in curr_line.lower():
-                    mid = index(curr_line, ':.')
+                    mid = index(curr_line, FIELD_VALUE_PATTERN)
                     category = curr_line[:mid[0]]
                     budget = curr_line[mid[1]:].strip()
                     categories.append((category, budget))
@@ -800,7 +1326,7 @@ def build_record_from_string(string):
 
             # Total
             curr_line = lines[line_index]
-            total = curr_line[index(curr_line, ':.')[1]:].strip()
+            total = curr_line[index(curr_line, FIELD_VALUE_PATTERN)[1]:].strip()
             line_index += 2
 
             supports[section] = Supports(goals, categories, total)
@@ -808,7 +1334,7 @@ def build_record_from_string(string):
         # Get the line index to the last section of constant data
         line_index += 2
         const_indices = list(range(line_index, line_index + 5))
-        const_data.extend([lines[i][index(lines[i], ':.')[1]:].strip() for i in const_indices])
+        const_data.extend([lines[i][index(lines[i], FIELD_VALUE_PATTERN)[1]:].strip() for i in const_indices])
 
         # Build a Client object
         client = Client(
@@ -0,0 +1,97 @@
+import threading
+
+# The functions that have been wrapped, by (owner, name), as (original function, wrappers). Each
+# wrapper is a (tag, wrap) pair, where wrap takes a function and returns the wrapped function, and
+# they are applied in order, so the last one added is the outermost
+patches = {}
+lock = threading.Lock()
+
+
+def apply(owner, name):
+    """Replaces a function with the original function wrapped by each of its wrappers in order
+
+    Args:
+        owner(object): The module or class the function belongs to
+        name(str): The name of the function
+
+    Returns:
+        None
+
+    """
+    function, wrappers = patches[(owner, name)]
+    for _, wrap in wrappers:
+        function = wrap(function)
+
+    setattr(owner, name, function)
+
+
+def wrap_function(owner, name, tag, wrap):
+    """Replaces a function of a module or class with a wrapped one, on top of any wrappers with other
+    tags, so metrics and tracing can be switched on and off independently of each other
+
+    The function is replaced where it is defined, so code that calls it through its module or class
+    gets the wrapped one, but not code that imported it by name before this was called
+
+    Args:
+        owner(object): The module or class the function belongs to
+        name(str): The name of the function
+        tag(str): What the wrapper is for, such as metrics or tracing, which unwrap_functions
+            removes it by
+        wrap(function): Takes the function and returns the wrapped one
+
+    Returns:
+        None
+
+    """
+    with lock:
+        patch = patches.get((owner, name))
+        if patch is None:
+            function = vars(owner).get(name)
+            if not callable(function):
+                return
+
+            patch = patches[(owner, name)] = (function, [])
+
+        if any(wrapper_tag == tag for wrapper_tag, _ in patch[1]):
+            return
+
+        patch[1].append((tag, wrap))
+        apply(owner, name)
+
+
+def unwrap_functions(tag):
+    """Removes the wrappers with a tag, keeping any with other tags
+
+    Args:
+        tag(str): The tag the wrappers were added with
+
+    Returns:
+        None
+
+    """
+    with lock:
+        for (owner, name), (function, wrappers) in list(patches.items()):
+            remaining = [wrapper for wrapper in wrappers if wrapper[0] != tag]
+            if len(remaining) == len(wrappers):
+                continue
+
+            wrappers[:] = remaining
+            if remaining:
+                apply(owner, name)
+            else:
+                setattr(owner, name, function)
+                del patches[(owner, name)]
+
+
+def is_wrapped(tag):
+    """Checks whether any function has a wrapper with a tag
+
+    Args:
+        tag(str): The tag the wrappers were added with
+
+    Returns:
+        bool: True if any function is wrapped with the tag, False otherwise
+
+    """
+    with lock:
+        return any(wrapper_tag == tag for _, wrappers in patches.values() for wrapper_tag, _ in wrappers)
@@ -0,0 +1,274 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from batch import find_documents
+from parse import build_record_from_bytes
+from serialize import dumps_binary, loads_binary
+
+DEFAULT_QUEUE_SIZE = 8
+
+# Put on a queue once for each worker of the next stage to tell it there is nothing left to do
+DONE = None
+
+
+def build_record(data):
+    """Extracts the contents of a word document and builds a Record object from them in a worker
+    process, so only the document and the Record object, in a form that is cheap to send back, pass
+    between processes
+
+    Args:
+        data(bytes): The contents of a word document
+
+    Returns:
+        bytes: The built Record object, serialized by dumps_binary
+
+    """
+    return dumps_binary(build_record_from_bytes(data))
+
+
+def read_file(path):
+    """Reads a file into memory
+
+    Args:
+        path(str): The path of the file
+
+    Returns:
+        bytes: The contents of the file
+
+    """
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def export_record(data, export_folder, raw_xml=False):
+    """Exports the data in a Record object into all of the output documents
+
+    Args:
+        data(bytes): A Record object serialized by dumps_binary
+        export_folder(str): The absolute path of the folder to export to
+        raw_xml(bool): Whether to render the word documents' xml directly instead of through
+            python-docx (optional)
+
+    Returns:
+        None
+
+    """
+    from export import export_all
+
+    export_all(loads_binary(data), export_folder, raw_xml)
+
+
+class Stage:
+    def __init__(self, name, function, executor, concurrency):
+        """A step of the pipeline, which runs a function on each item passed to it
+
+        Args:
+            name(str): The name of the stage to report
+            function(function): The function to run on each item, which is given the item and returns
+                the item to pass to the next stage
+            executor(concurrent.futures.Executor): The executor to run the function on
+            concurrency(int): The number of items the stage works on at once
+
+        """
+        self.name = name
+        self.function = function
+        self.executor = executor
+        self.concurrency = concurrency
+
+        self.items = 0
+        self.busy_time = 0
+        self.first_start = None
+        self.last_end = None
+
+    async def work(self, inbox, outbox, failures):
+        """Takes items off the inbox and passes the results to the outbox until told to stop
+
+        Args:
+            inbox(asyncio.Queue): The queue of (path, item) pairs to work on
+            outbox(asyncio.Queue): The queue to put (path, result) pairs on, or None if this is the
+                last stage
+            failures(list((str, str))): The list to add the path and error message of each failed
+                item to
+
+        Returns:
+            None
+
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await inbox.get()
+            if job is DONE:
+                return
+
+            path, item = job
+            start = time.perf_counter()
+            if self.first_start is None:
+                self.first_start = start
+
+            try:
+                result = await loop.run_in_executor(self.executor, self.function, item)
+            except Exception as e:
+                failures.append((path, f'{self.name}: {type(e).__name__}: {e}'))
+                continue
+            finally:
+                self.last_end = time.perf_counter()
+
+            # Only count the items that got through, so the time per item isn't skewed by failures
+            self.items += 1
+            self.busy_time += self.last_end - start
+            if outbox is not None:
+                # Waits here while the next stage is behind, which holds this stage back too
+                await outbox.put((path, result))
+
+    async def run(self, inbox, outbox, failures, next_concurrency):
+        """Runs the stage's workers, then tells each worker of the next stage to stop
+
+        Args:
+            inbox(asyncio.Queue): The queue of (path, item) pairs to work on
+            outbox(asyncio.Queue): The queue to put (path, result) pairs on, or None if this is the
+                last stage
+            failures(list((str, str))): The list to add the path and error message of each failed
+                item to
+            next_concurrency(int): The number of workers the next stage has
+
+        Returns:
+            None
+
+        """
+        await asyncio.gather(*(self.work(inbox, outbox, failures) for _ in range(self.concurrency)))
+        if outbox is not None:
+            for _ in range(next_concurrency):
+                await outbox.put(DONE)
+
+    def get_throughput(self):
+        """Gets how many items per second the stage got through while it was running
+
+        Returns:
+            float: The throughput of the stage
+
+        """
+        if not self.items:
+            return 0
+
+        return self.items / max(self.last_end - self.first_start, 1e-9)
+
+
+async def run_pipeline(paths, stages, queue_size=DEFAULT_QUEUE_SIZE):
+    """Passes each path through the stages in turn, with every stage working at the same time
+
+    Args:
+        paths(list(str)): The paths to pass to the first stage
+        stages(list(Stage)): The stages of the pipeline, in order
+        queue_size(int): The most items that can wait between two stages before the earlier stage
+            has to wait for the later one to catch up (optional)
+
+    Returns:
+        list((str, str)): The path and error message of each item that failed
+
+    """
+    failures = []
+    queues = [asyncio.Queue(maxsize=queue_size) for _ in stages]
+
+    async def feed():
+        for path in paths:
+            await queues[0].put((path, path))
+
+        for _ in range(stages[0].concurrency):
+            await queues[0].put(DONE)
+
+    tasks = [feed()]
+    for i, stage in enumerate(stages):
+        last = i == len(stages) - 1
+        tasks.append(stage.run(
+            queues[i],
+            None if last else queues[i + 1],
+            failures,
+            0 if last else stages[i + 1].concurrency
+        ))
+
+    await asyncio.gather(*tasks)
+    return failures
+
+
+def main(argv=None):
+    """Parses, and optionally exports, every document in a folder as a pipeline and prints the
+    throughput of each stage
+
+    Args:
+        argv(list(str)): The command line arguments (optional)
+
+    Returns:
+        int: The exit code, which is non-zero if any document failed
+
+    """
+    parser = argparse.ArgumentParser(description='Parse a folder of NDIS plans as a pipeline.')
+    parser.add_argument('folder', help='the folder containing the word documents to parse')
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help='also parse documents in subfolders')
+    parser.add_argument('-o', '--output-folder', default='',
+                        help='a folder to export the output documents of each document to')
+    parser.add_argument('-q', '--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help='the most documents waiting between two stages (default: %(default)s)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='the number of worker processes for building records (default: one per CPU)')
+    parser.add_argument('--read-concurrency', type=int, default=4,
+                        help='the number of files read at once (default: %(default)s)')
+    parser.add_argument('--build-concurrency', type=int, default=None,
+                        help='the number of documents extracted and built into records at once '
+                             '(default: the number of workers)')
+    parser.add_argument('--export-concurrency', type=int, default=2,
+                        help='the number of records exported at once (default: %(default)s)')
+    parser.add_argument('--raw-xml', action='store_true',
+                        help='render the word documents without python-docx, which is faster')
+    args = parser.parse_args(argv)
+
+    paths = find_documents(args.folder, args.recursive)
+    if not paths:
+        print(f'No word documents found in {args.folder}')
+        return 0
+
+    workers = args.workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=args.read_concurrency + args.export_concurrency) as threads, \
+            ProcessPoolExecutor(max_workers=workers) as processes:
+        stages = [
+            Stage('read', read_file, threads, args.read_concurrency),
+            Stage('build', build_record, processes, args.build_concurrency or workers)
+        ]
+
+        if args.output_folder:
+            export_folder = os.path.abspath(args.output_folder)
+            os.makedirs(export_folder, exist_ok=True)
+            stages.append(Stage(
+                'export',
+                lambda data: export_record(data, export_folder, args.raw_xml),
+                threads,
+                args.export_concurrency
+            ))
+
+        start = time.perf_counter()
+        failures = asyncio.run(run_pipeline(paths, stages, args.queue_size))
+        elapsed = time.perf_counter() - start
+
+    print(f'Documents: {len(paths)}')
+    print(f'Succeeded: {len(paths) - len(failures)}')
+    print(f'Failed: {len(failures)}')
+    print(f'Elapsed: {elapsed:.2f}s')
+    print(f'Throughput: {len(paths) / elapsed:.2f} documents/s')
+    for stage in stages:
+        print(
+            f'    {stage.name}: {stage.items} items, {stage.get_throughput():.2f} items/s, '
+            f'{stage.busy_time / max(stage.items, 1) * 1000:.1f} ms/item'
+        )
+
+    for path, error in failures:
+        print(f'    {path}: {error}')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+import re
+
+from functools import lru_cache
+
+import numpy as np
+
+from parse import ALL_CATEGORIES, TBC, parse_date
+
+AMOUNT_PATTERN = re.compile(r'^\$?(\d{1,3}(?:,?\d{3})*)(?:\.(\d{2}))?$')
+SECTIONS = ('Core', 'Capacity Building', 'Capital')
+
+# The core supports flexible budget is listed as a category named after its section
+CATEGORIES = ('Core',) + tuple(category for category in ALL_CATEGORIES if category != 'Core')
+CATEGORY_COLUMNS = {category: i for i, category in enumerate(CATEGORIES)}
+
+# Amounts repeat across many plans, so each distinct one is only converted once
+CONVERSION_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def parse_cents(amount):
+    """Converts an amount of money the way plans write them into cents
+
+    Args:
+        amount(str): The amount, such as '$12,345.67'
+
+    Returns:
+        int: The amount in cents, or None if it is 'TBC' or isn't an amount
+
+    """
+    if amount is None or amount == TBC:
+        return None
+
+    match = AMOUNT_PATTERN.match(amount.strip())
+    if match is None:
+        return None
+
+    dollars, cents = match.groups()
+    return int(dollars.replace(',', '')) * 100 + int(cents or 0)
+
+
+def format_cents(cents):
+    """Formats an amount of money in cents the way plans write them
+
+    Args:
+        cents(int): The amount in cents
+
+    Returns:
+        str: The formatted amount, such as '$12,345.67'
+
+    """
+    sign = '-' if cents < 0 else ''
+    dollars, cents = divmod(abs(int(cents)), 100)
+    return f'{sign}${dollars:,}.{cents:02}'
+
+
+def normalize_record(record):
+    """Converts the amounts and dates in a Record object into numbers and ISO 8601 dates
+
+    Args:
+        record(Record): A Record object
+
+    Returns:
+        dict: The NDIS number, the plan's start and end dates as yyyy-mm-dd (or None), the funded
+            supports total in cents (or None), the total of each supports section in cents (or None)
+            and the budget of each category in cents, by category
+
+    """
+    categories = {}
+    for supports in record.supports.values():
+        if supports.categories == TBC:
+            continue
+
+        for category, budget in supports.categories:
+            cents = parse_cents(budget)
+            if cents is not None:
+                categories[category] = categories.get(category, 0) + cents
+
+    return {
+        'ndis_number': record.client.ndis_number,
+        'start_date': parse_date(record.plan.start_date),
+        'end_date': parse_date(record.plan.end_date),
+        'funded_supports_total': parse_cents(record.funded_supports_total),
+        'totals': {section: parse_cents(supports.total) for section, supports in record.supports.items()},
+        'categories': categories
+    }
+
+
+def to_datetime64(date):
+    """Converts a date to filter by into a numpy date
+
+    Args:
+        date(object): A datetime.date, an ISO 8601 string or a dd/mm/yyyy string
+
+    Returns:
+        numpy.datetime64: The date
+
+    """
+    if isinstance(date, str) and '/' in date:
+        date = parse_date(date)
+
+    return np.datetime64(date, 'D')
+
+
+class Portfolio:
+    def __init__(self, ndis_numbers, start_dates, end_dates, funded_totals, section_totals, category_budgets):
+        """Column arrays of the amounts and dates of many Records, one row per Record, so they can be
+        summed and filtered without going through the Records one at a time
+
+        Amounts are int64 cents, with missing amounts counted as 0 and missing dates as NaT
+
+        Args:
+            ndis_numbers(numpy.ndarray): The NDIS number of each Record
+            start_dates(numpy.ndarray): The plan start date of each Record, as datetime64[D]
+            end_dates(numpy.ndarray): The plan end date of each Record, as datetime64[D]
+            funded_totals(numpy.ndarray): The funded supports total of each Record
+            section_totals(numpy.ndarray): The total of each section in SECTIONS, one column each
+            category_budgets(numpy.ndarray): The budget of each category in CATEGORIES, one column each
+
+        """
+        self.ndis_numbers = ndis_numbers
+        self.start_dates = start_dates
+        self.end_dates = end_dates
+        self.funded_totals = funded_totals
+        self.section_totals = section_totals
+        self.category_budgets = category_budgets
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds the columns out of Record objects
+
+        Args:
+            records(iterable(Record)): The Record objects
+
+        Returns:
+            Portfolio: The columns of the Records
+
+        """
+        rows = [normalize_record(record) for record in records]
+        count = len(rows)
+
+        ndis_numbers = np.empty(count, dtype=object)
+        start_dates = np.full(count, np.datetime64('NaT'), dtype='datetime64[D]')
+        end_dates = np.full(count, np.datetime64('NaT'), dtype='datetime64[D]')
+        funded_totals = np.zeros(count, dtype=np.int64)
+        section_totals = np.zeros((count, len(SECTIONS)), dtype=np.int64)
+        category_budgets = np.zeros((count, len(CATEGORIES)), dtype=np.int64)
+
+        for i, row in enumerate(rows):
+            ndis_numbers[i] = row['ndis_number']
+            if row['start_date'] is not None:
+                start_dates[i] = row['start_date']
+
+            if row['end_date'] is not None:
+                end_dates[i] = row['end_date']
+
+            funded_totals[i] = row['funded_supports_total'] or 0
+            for j, section in enumerate(SECTIONS):
+                section_totals[i, j] = row['totals'].get(section) or 0
+
+            for category, cents in row['categories'].items():
+                column = CATEGORY_COLUMNS.get(category)
+                if column is not None:
+                    category_budgets[i, column] = cents
+
+        return cls(ndis_numbers, start_dates, end_dates, funded_totals, section_totals, category_budgets)
+
+    def __len__(self):
+        return len(self.ndis_numbers)
+
+    def select(self, mask):
+        """Selects some of the rows
+
+        Args:
+            mask(numpy.ndarray): A boolean array with one value per row, True for the rows to keep
+
+        Returns:
+            Portfolio: The selected rows
+
+        """
+        return Portfolio(
+            self.ndis_numbers[mask],
+            self.start_dates[mask],
+            self.end_dates[mask],
+            self.funded_totals[mask],
+            self.section_totals[mask],
+            self.category_budgets[mask]
+        )
+
+    def filter_dates(self, start=None, end=None, column='start_date'):
+        """Selects the plans whose start or end date falls within a date range
+
+        Plans without that date are never selected
+
+        Args:
+            start(object): The first date of the range, or None for no lower bound (optional)
+            end(object): The last date of the range, or None for no upper bound (optional)
+            column(str): The date to filter by, 'start_date' or 'end_date' (optional)
+
+        Returns:
+            Portfolio: The selected plans
+
+        """
+        dates = self.start_dates if column == 'start_date' else self.end_dates
+
+        # NaT compares false with every date, so plans without the date are left out
+        mask = ~np.isnat(dates)
+        if start is not None:
+            mask &= dates >= to_datetime64(start)
+
+        if end is not None:
+            mask &= dates <= to_datetime64(end)
+
+        return self.select(mask)
+
+    def filter_active(self, start, end):
+        """Selects the plans that are running for at least part of a date range
+
+        Args:
+            start(object): The first date of the range
+            end(object): The last date of the range
+
+        Returns:
+            Portfolio: The selected plans
+
+        """
+        start = to_datetime64(start)
+        end = to_datetime64(end)
+        return self.select((self.start_dates <= end) & (self.end_dates >= start))
+
+    def get_funded_total(self):
+        """Sums the funded supports totals
+
+        Returns:
+            int: The sum in cents
+
+        """
+        return int(self.funded_totals.sum())
+
+    def get_section_totals(self):
+        """Sums the total of each supports section
+
+        Returns:
+            dict(str, int): The sum in cents, by section
+
+        """
+        return dict(zip(SECTIONS, self.section_totals.sum(axis=0).tolist()))
+
+    def get_category_totals(self):
+        """Sums the budget of each category, leaving out categories no plan has a budget for
+
+        Returns:
+            dict(str, int): The sum in cents, by category
+
+        """
+        totals = self.category_budgets.sum(axis=0).tolist()
+        return {category: total for category, total in zip(CATEGORIES, totals) if total}
+
+    def get_category_counts(self):
+        """Counts the plans with a budget for each category, leaving out categories no plan has a
+        budget for
+
+        Returns:
+            dict(str, int): The number of plans, by category
+
+        """
+        counts = np.count_nonzero(self.category_budgets, axis=0).tolist()
+        return {category: count for category, count in zip(CATEGORIES, counts) if count}
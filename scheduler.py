@@ -0,0 +1,233 @@
+import os
+import sys
+import threading
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from export import (
+    RawWordTemplate,
+    WordTemplate,
+    excel_export,
+    get_export_paths,
+    get_goals,
+    get_template,
+    record_export,
+    word_export_template
+)
+from serialize import dumps_binary, loads_binary
+
+DEFAULT_PENDING_PER_WORKER = 2
+
+
+def run_export_job(exporter, record, args, traced=False, instrumented=False):
+    """Runs one export job in a worker
+
+    Args:
+        exporter(function): The export function to run
+        record(Record): The Record object to export, or the bytes of one serialized by dumps_binary
+        args(tuple): The arguments to pass to the export function after the Record object
+        traced(bool): Whether to record trace spans of the job, for jobs run on worker processes
+            (optional)
+        instrumented(bool): Whether to record metrics of the job, for jobs run on worker processes
+            (optional)
+
+    Returns:
+        (list(dict), dict): A 2-tuple containing the trace events recorded during the job (or None)
+            and a snapshot of the metrics recorded during it (or None)
+
+    """
+    if instrumented:
+        import metrics
+
+        metrics.enable()
+
+    if traced:
+        import tracing
+
+        tracing.enable()
+
+    if traced or instrumented:
+        # The exporter was looked up by name in this process, so it may not be the wrapped one
+        exporter = getattr(sys.modules[exporter.__module__], exporter.__name__)
+
+    try:
+        if isinstance(record, bytes):
+            record = loads_binary(record)
+
+        exporter(record, *args)
+    finally:
+        # Take what the job recorded even if it failed, so none of it is sent back with the next job
+        events = tracing.tracer.take() if traced else None
+        snapshot = metrics.metrics.take() if instrumented else None
+
+    return events, snapshot
+
+
+class ExportScheduler:
+    def __init__(self, export_folder, workers=None, use_processes=False, max_pending=None, raw_xml=False,
+                 traced=False, instrumented=False):
+        """Runs the exports of many Record objects concurrently, with each output document rendered as
+        its own job
+
+        Args:
+            export_folder(str): The absolute path of the folder to export to
+            workers(int): The number of worker threads or processes, or None to use one per CPU
+                (optional)
+            use_processes(bool): Whether to run the jobs on worker processes instead of threads
+                (optional)
+            max_pending(int): The most jobs that can be queued or running at once, after which
+                submit blocks until one finishes, or None for DEFAULT_PENDING_PER_WORKER per worker
+                (optional)
+            raw_xml(bool): Whether to render the word documents' xml directly instead of through
+                python-docx (optional)
+            traced(bool): Whether to add the trace spans of jobs run on worker processes to this
+                process's tracer, which records the jobs run on threads itself once enabled (optional)
+            instrumented(bool): Whether to add the metrics of jobs run on worker processes to this
+                process's metrics, which records the jobs run on threads itself once enabled (optional)
+
+        """
+        self.export_folder = export_folder
+        self.use_processes = use_processes
+        self.raw_xml = raw_xml
+        self.traced = traced and use_processes
+        self.instrumented = instrumented and use_processes
+
+        workers = workers or os.cpu_count() or 1
+        if use_processes:
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+
+        # Limits how many Record objects and rendered documents are held in memory at once
+        self.pending = threading.BoundedSemaphore(max_pending or DEFAULT_PENDING_PER_WORKER * workers)
+
+        # The (description, error message) of each job that failed
+        self.errors = []
+        self.errors_lock = threading.Lock()
+
+    def schedule(self, description, exporter, record, args):
+        """Queues one export job, blocking while too many jobs are already pending
+
+        Args:
+            description(str): A description of the job to report if it fails
+            exporter(function): The export function to run
+            record(Record): The Record object to export, or the bytes of one serialized by
+                dumps_binary
+            args(tuple): The arguments to pass to the export function after the Record object
+
+        Returns:
+            None
+
+        """
+        self.pending.acquire()
+        try:
+            future = self.executor.submit(
+                run_export_job, exporter, record, args, self.traced, self.instrumented
+            )
+        except BaseException:
+            self.pending.release()
+            raise
+
+        future.add_done_callback(lambda f: self.finish(description, f))
+
+    def finish(self, description, future):
+        """Records the result of a finished job and makes room for another one
+
+        Args:
+            description(str): A description of the job
+            future(concurrent.futures.Future): The finished job
+
+        Returns:
+            None
+
+        """
+        self.pending.release()
+        error = future.exception()
+        if error is not None:
+            with self.errors_lock:
+                self.errors.append((description, f'{type(error).__name__}: {error}'))
+            return
+
+        events, snapshot = future.result()
+        if events is not None:
+            import tracing
+
+            tracing.tracer.merge(events)
+
+        if snapshot is not None:
+            import metrics
+
+            metrics.metrics.merge(snapshot)
+
+    def submit(self, record):
+        """Queues the export of a Record object into all of the output documents
+
+        Args:
+            record(Record): A Record object
+
+        Returns:
+            None
+
+        """
+        # Worker processes get the Record object in the compact binary format instead of pickled
+        data = dumps_binary(record) if self.use_processes else record
+        template_class = RawWordTemplate if self.raw_xml else WordTemplate
+
+        # The goals are shared between the word documents in order, so give each one its own share
+        goals = get_goals(record)
+        for src, dst in get_export_paths(record, self.export_folder, 'docx'):
+            goal_count = get_template(src, template_class).goal_count
+            self.schedule(
+                os.path.basename(dst),
+                word_export_template,
+                data,
+                (src, dst, goals[:goal_count], self.raw_xml)
+            )
+            goals = goals[goal_count:]
+
+        name = record.client.full_name
+        self.schedule(f'{name} (excel)', excel_export, data, (self.export_folder,))
+        self.schedule(f'{name} (data)', record_export, data, (self.export_folder,))
+
+    def close(self):
+        """Waits for every queued job to finish and shuts down the workers
+
+        Returns:
+            list((str, str)): The description and error message of each job that failed
+
+        """
+        self.executor.shutdown(wait=True)
+        return self.errors
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def export_records(records, export_folder, workers=None, use_processes=False, max_pending=None,
+                   raw_xml=False):
+    """Exports the data in many Record objects into all of the output documents concurrently
+
+    Args:
+        records(iterable(Record)): The Record objects to export, which are only consumed as fast as
+            the workers can keep up with
+        export_folder(str): The absolute path of the folder to export to
+        workers(int): The number of worker threads or processes, or None to use one per CPU (optional)
+        use_processes(bool): Whether to run the jobs on worker processes instead of threads (optional)
+        max_pending(int): The most jobs that can be queued or running at once (optional)
+        raw_xml(bool): Whether to render the word documents' xml directly instead of through
+            python-docx (optional)
+
+    Returns:
+        list((str, str)): The description and error message of each job that failed
+
+    """
+    scheduler = ExportScheduler(export_folder, workers, use_processes, max_pending, raw_xml)
+    try:
+        for record in records:
+            scheduler.submit(record)
+    finally:
+        errors = scheduler.close()
+
+    return errors
@@ -0,0 +1,229 @@
+import json
+import marshal
+
+from parse import SHARED_FIELDS, Client, Location, Plan, Record, Supports, share
+
+FORMAT_VERSION = 1
+BINARY_HEADER = b'NDR' + bytes([FORMAT_VERSION])
+MARSHAL_VERSION = 4
+CLIENT_FIELDS = (
+    'title',
+    'full_name',
+    'first_name',
+    'last_name',
+    'gender',
+    'dob',
+    'home_phone_number',
+    'mobile_phone_number',
+    'email_address',
+    'ndis_number'
+)
+LOCATION_FIELDS = ('house_number', 'street', 'suburb', 'state', 'postcode')
+PLAN_FIELDS = ('start_date', 'end_date')
+SUPPORTS_FIELDS = ('goals', 'categories', 'total')
+RECORD_FIELDS = (
+    'support_coordination_management_type',
+    'support_coordination_hours',
+    'funded_supports_total',
+    'additional_email_address',
+    'service_region_id'
+)
+
+
+def build_object(cls, attributes):
+    """Builds an object directly from its attributes, without running its constructor, sharing the
+    values of fields in SHARED_FIELDS the same way the constructor would
+
+    Args:
+        cls(type): The class of the object
+        attributes(dict): The attribute names and values of the object
+
+    Returns:
+        object: The built object
+
+    """
+    obj = cls.__new__(cls)
+    for name, value in attributes.items():
+        setattr(obj, name, share(value) if name in SHARED_FIELDS else value)
+
+    return obj
+
+
+def freeze(value):
+    """Converts lists back into the tuples that the parser produces
+
+    Args:
+        value: A deserialized value
+
+    Returns:
+        The value with every list, including nested ones, converted into a tuple
+
+    """
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+
+    return value
+
+
+def thaw(value):
+    """Converts tuples into lists so that they can be serialized
+
+    Args:
+        value: A value from a Record object
+
+    Returns:
+        The value with every tuple, including nested ones, converted into a list
+
+    """
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+
+    return value
+
+
+def record_to_dict(record):
+    """Converts a Record object into a dictionary of plain values
+
+    Args:
+        record(Record): A Record object
+
+    Returns:
+        dict: The dictionary, which only contains dicts, lists, strings and None
+
+    """
+    client = {field: getattr(record.client, field) for field in CLIENT_FIELDS}
+    client['address'] = {field: getattr(record.client.address, field) for field in LOCATION_FIELDS}
+
+    data = {
+        'version': FORMAT_VERSION,
+        'client': client,
+        'plan': {field: getattr(record.plan, field) for field in PLAN_FIELDS},
+        'supports': {
+            section: {field: thaw(getattr(supports, field)) for field in SUPPORTS_FIELDS}
+            for section, supports in record.supports.items()
+        }
+    }
+    data.update({field: getattr(record, field) for field in RECORD_FIELDS})
+
+    return data
+
+
+def record_from_dict(data):
+    """Builds a Record object from a dictionary made by record_to_dict
+
+    Args:
+        data(dict): The dictionary
+
+    Returns:
+        Record: The built Record object
+
+    Raises:
+        ValueError: If the dictionary was made by an incompatible version of this module
+
+    """
+    if data.get('version') != FORMAT_VERSION:
+        raise ValueError(f'Unsupported record format version: {data.get("version")}')
+
+    client = dict(data['client'])
+    client['address'] = build_object(Location, client['address'])
+
+    return build_object(Record, dict(
+        {field: data[field] for field in RECORD_FIELDS},
+        client=build_object(Client, client),
+        plan=build_object(Plan, data['plan']),
+        supports={
+            section: build_object(Supports, {field: freeze(value) for field, value in supports.items()})
+            for section, supports in data['supports'].items()
+        }
+    ))
+
+
+def dumps_json(record):
+    """Serializes a Record object into JSON
+
+    Args:
+        record(Record): A Record object
+
+    Returns:
+        str: The JSON string
+
+    """
+    return json.dumps(record_to_dict(record), ensure_ascii=False, separators=(',', ':'))
+
+
+def loads_json(string):
+    """Deserializes a Record object from JSON made by dumps_json
+
+    Args:
+        string(str): The JSON string
+
+    Returns:
+        Record: The deserialized Record object
+
+    """
+    return record_from_dict(json.loads(string))
+
+
+def dumps_binary(record):
+    """Serializes a Record object into a compact binary format
+
+    The values are laid out positionally, in the order of the *_FIELDS tuples, and encoded with
+    marshal, so no field names or class names are stored. marshal's format may change between
+    Python versions, so the data should only be loaded by the Python version that made it
+
+    Args:
+        record(Record): A Record object
+
+    Returns:
+        bytes: The serialized Record object
+
+    """
+    client = record.client
+    values = (
+        tuple(getattr(client, field) for field in CLIENT_FIELDS),
+        tuple(getattr(client.address, field) for field in LOCATION_FIELDS),
+        tuple(getattr(record.plan, field) for field in PLAN_FIELDS),
+        tuple(
+            (section, *(freeze(getattr(supports, field)) for field in SUPPORTS_FIELDS))
+            for section, supports in record.supports.items()
+        ),
+        tuple(getattr(record, field) for field in RECORD_FIELDS)
+    )
+
+    return BINARY_HEADER + marshal.dumps(values, MARSHAL_VERSION)
+
+
+def loads_binary(data):
+    """Deserializes a Record object from data made by dumps_binary
+
+    Args:
+        data(bytes): The serialized Record object
+
+    Returns:
+        Record: The deserialized Record object
+
+    Raises:
+        ValueError: If the data isn't a serialized Record object, or was made by an incompatible
+            version of this module
+
+    """
+    if data[:len(BINARY_HEADER)] != BINARY_HEADER:
+        raise ValueError('Not a serialized Record object, or an unsupported format version')
+
+    try:
+        client, address, plan, supports, record = marshal.loads(data[len(BINARY_HEADER):])
+    except (EOFError, TypeError) as e:
+        raise ValueError(f'Corrupt serialized Record object: {e}')
+
+    client = dict(zip(CLIENT_FIELDS, client))
+    client['address'] = build_object(Location, dict(zip(LOCATION_FIELDS, address)))
+
+    return build_object(Record, dict(
+        zip(RECORD_FIELDS, record),
+        client=build_object(Client, client),
+        plan=build_object(Plan, dict(zip(PLAN_FIELDS, plan))),
+        supports={
+            section: build_object(Supports, dict(zip(SUPPORTS_FIELDS, values)))
+            for section, *values in supports
+        }
+    ))
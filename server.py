@@ -0,0 +1,320 @@
+import argparse
+import io
+import json
+import os
+import signal
+import sys
+import tempfile
+import zipfile
+
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+JSON_CONTENT_TYPE = 'application/json'
+ZIP_CONTENT_TYPE = 'application/zip'
+
+# Output documents that are already compressed, so zipping them again would only waste time
+COMPRESSED_EXTENSIONS = ('.docx', '.xlsx')
+
+
+def warm_up(raw_xml=False):
+    """Imports everything a request needs and loads the templates, so no request pays for it
+
+    Args:
+        raw_xml(bool): Whether the word documents will be rendered from their raw xml (optional)
+
+    Returns:
+        None
+
+    """
+    import docx  # noqa: F401
+    import openpyxl  # noqa: F401
+    import parse  # noqa: F401
+    from export import RawWordTemplate, Template, WordTemplate, get_resources, get_template
+
+    for src in get_resources('docx'):
+        get_template(src, RawWordTemplate if raw_xml else WordTemplate)
+
+    for src in get_resources('xlsx'):
+        get_template(src, Template)
+
+
+def parse_upload(data):
+    """Builds a Record object from an uploaded word document
+
+    Args:
+        data(bytes): The contents of the word document
+
+    Returns:
+        Record: The built Record object
+
+    """
+    from parse import build_record_from_bytes
+
+    return build_record_from_bytes(data)
+
+
+def export_upload(record, raw_xml=False):
+    """Exports a Record object into all of the output documents and zips them up
+
+    Args:
+        record(Record): A Record object
+        raw_xml(bool): Whether to render the word documents' xml directly instead of through
+            python-docx (optional)
+
+    Returns:
+        bytes: The zip of the output documents
+
+    """
+    from export import export_all
+
+    buffer = io.BytesIO()
+    with tempfile.TemporaryDirectory() as export_folder:
+        export_all(record, export_folder, raw_xml)
+
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for filename in sorted(os.listdir(export_folder)):
+                compress_type = zipfile.ZIP_STORED
+                if not filename.endswith(COMPRESSED_EXTENSIONS):
+                    compress_type = zipfile.ZIP_DEFLATED
+
+                archive.write(os.path.join(export_folder, filename), filename, compress_type)
+
+    return buffer.getvalue()
+
+
+def get_content_disposition(filename):
+    """Gets the Content-Disposition header that downloads a response as a file
+
+    Header values are sent as latin-1, so the name is given both as a plain ASCII fallback and
+    percent-encoded as UTF-8 (RFC 5987) for clients that support it
+
+    Args:
+        filename(str): The name of the file
+
+    Returns:
+        str: The header value
+
+    """
+    fallback = ''.join(
+        character if ' ' <= character <= '~' and character not in '"\\' else '_'
+        for character in filename
+    )
+    return f'attachment; filename="{fallback}"; filename*=UTF-8\'\'{quote(filename, safe="")}'
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests of the parse and export service
+
+    POST /parse takes a word document as the request body and returns its Record as JSON, and
+    POST /export takes one and returns a zip of its output documents. Adding ?raw_xml=1 to /export
+    renders the word documents without python-docx. GET /health checks the service is up
+    """
+    server_version = 'NDISDocParser'
+    max_upload_size = DEFAULT_MAX_UPLOAD_SIZE
+
+    def send_body(self, status, content_type, body, headers=None):
+        """Sends a complete response
+
+        Args:
+            status(int): The HTTP status code
+            content_type(str): The content type of the body
+            body(bytes): The body of the response
+            headers(dict(str, str)): Any extra headers to send (optional)
+
+        Returns:
+            None
+
+        """
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, data):
+        """Sends a JSON response
+
+        Args:
+            status(int): The HTTP status code
+            data(dict): The data to send
+
+        Returns:
+            None
+
+        """
+        self.send_body(status, JSON_CONTENT_TYPE, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    def read_upload(self):
+        """Reads the uploaded word document from the request body, sending an error if there isn't one
+
+        Returns:
+            bytes: The contents of the word document, or None if an error was sent
+
+        """
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self.send_json(411, {'error': 'A Content-Length header is required'})
+            return None
+
+        if length <= 0:
+            self.send_json(400, {'error': 'Upload a word document as the request body'})
+            return None
+
+        if length > self.max_upload_size:
+            self.send_json(413, {'error': f'Uploads are limited to {self.max_upload_size} bytes'})
+            return None
+
+        return self.rfile.read(length)
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/health':
+            self.send_json(200, {'status': 'ok', 'pid': os.getpid()})
+        else:
+            self.send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path not in ('/parse', '/export'):
+            self.send_json(404, {'error': 'Not found'})
+            return
+
+        data = self.read_upload()
+        if data is None:
+            return
+
+        try:
+            record = parse_upload(data)
+        except Exception as e:
+            self.send_json(422, {'error': f'{type(e).__name__}: {e}'})
+            return
+
+        if url.path == '/parse':
+            from serialize import record_to_dict
+
+            self.send_json(200, record_to_dict(record))
+            return
+
+        raw_xml = parse_qs(url.query).get('raw_xml', ['0'])[0] not in ('', '0', 'false')
+        try:
+            body = export_upload(record, raw_xml)
+        except Exception as e:
+            self.send_json(500, {'error': f'{type(e).__name__}: {e}'})
+            return
+
+        filename = f'{record.client.last_name}, {record.client.first_name}.zip'
+        self.send_body(200, ZIP_CONTENT_TYPE, body, {'Content-Disposition': get_content_disposition(filename)})
+
+
+def serve_forked(server, workers):
+    """Serves requests on worker processes forked from this one, restarting any that die
+
+    Every worker inherits the listening socket and everything this process already imported and
+    loaded, so each one is warm from its first request
+
+    Args:
+        server(HTTPServer): The server, already bound to its address
+        workers(int): The number of worker processes
+
+    Returns:
+        None
+
+    """
+    children = set()
+
+    def fork():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+
+        children.add(pid)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for _ in range(workers):
+            fork()
+
+        while True:
+            pid, _ = os.wait()
+            if pid in children:
+                children.discard(pid)
+                fork()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+
+        server.server_close()
+
+
+def main(argv=None):
+    """Runs the parse and export service
+
+    Args:
+        argv(list(str)): The command line arguments (optional)
+
+    Returns:
+        int: The exit code
+
+    """
+    parser = argparse.ArgumentParser(description='Serve the NDIS plan parser over HTTP.')
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help='the address to listen on (default: %(default)s)')
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT,
+                        help='the port to listen on (default: %(default)s)')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='the number of worker processes (default: one per CPU)')
+    parser.add_argument('--max-upload-size', type=int, default=DEFAULT_MAX_UPLOAD_SIZE // (1024 * 1024),
+                        help='the size limit of uploads in megabytes (default: %(default)s)')
+    parser.add_argument('--raw-xml', action='store_true',
+                        help='load the templates for rendering without python-docx')
+    args = parser.parse_args(argv)
+
+    RequestHandler.max_upload_size = args.max_upload_size * 1024 * 1024
+    warm_up(args.raw_xml)
+
+    # Forking is only available on Unix, so elsewhere the requests are served on threads instead
+    if hasattr(os, 'fork') and args.workers > 1:
+        server = HTTPServer((args.host, args.port), RequestHandler)
+        print(f'Serving on http://{args.host}:{args.port} with {args.workers} worker processes')
+        serve_forked(server, args.workers)
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), RequestHandler)
+        print(f'Serving on http://{args.host}:{args.port}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
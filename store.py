@@ -0,0 +1,370 @@
+import argparse
+import datetime
+import os
+import sqlite3
+import sys
+
+from parse import TBC, parse_date
+from serialize import dumps_json, loads_json
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser('~'), '.ndis-doc-parser', 'records.db')
+
+# Change this whenever the schema changes, and add a migration for stores made by the older version
+SCHEMA_VERSION = 1
+
+# The most Record objects batch jobs add in each transaction
+DEFAULT_BATCH_SIZE = 500
+
+# How long a connection waits for another process's write to finish before giving up
+BUSY_TIMEOUT = 30
+
+SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS records (
+        id INTEGER PRIMARY KEY,
+        ndis_number TEXT,
+        first_name TEXT,
+        last_name TEXT,
+        start_date TEXT,
+        end_date TEXT,
+        source TEXT,
+        plan_key TEXT UNIQUE,
+        updated TEXT NOT NULL,
+        data TEXT NOT NULL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS records_ndis_number ON records (ndis_number)',
+    'CREATE INDEX IF NOT EXISTS records_last_name ON records (last_name COLLATE NOCASE)',
+    'CREATE INDEX IF NOT EXISTS records_start_date ON records (start_date)',
+    'CREATE INDEX IF NOT EXISTS records_end_date ON records (end_date)'
+)
+
+# A plan that is imported again replaces the earlier import of the same plan
+INSERT_SQL = '''
+    INSERT INTO records
+        (ndis_number, first_name, last_name, start_date, end_date, source, plan_key, updated, data)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (plan_key) DO UPDATE SET
+        ndis_number = excluded.ndis_number,
+        first_name = excluded.first_name,
+        last_name = excluded.last_name,
+        start_date = excluded.start_date,
+        end_date = excluded.end_date,
+        source = excluded.source,
+        updated = excluded.updated,
+        data = excluded.data
+'''
+
+
+def get_plan_key(ndis_number, start_date, source):
+    """Gets the value that identifies a plan, so importing it again replaces the earlier import
+
+    Args:
+        ndis_number(str): The client's NDIS number, or None if it is unknown
+        start_date(str): The plan's start date as yyyy-mm-dd, or None if it is unknown
+        source(str): The path of the document the plan was imported from, or ''
+
+    Returns:
+        str: The NDIS number and start date if both are known, otherwise the document's path, or None
+            if that isn't known either
+
+    """
+    if ndis_number is not None and start_date is not None:
+        return f'plan:{ndis_number}:{start_date}'
+
+    # Plans missing either value can only be recognised by the document they came from
+    return f'source:{source}' if source else None
+
+
+def get_next_month(today=None):
+    """Gets the first and last days of next month
+
+    Args:
+        today(datetime.date): The date to count from, or None to use today's date (optional)
+
+    Returns:
+        (datetime.date, datetime.date): The first and last days of next month
+
+    """
+    today = today or datetime.date.today()
+    first = (today.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+    last = (first + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+
+    return first, last
+
+
+class RecordStore:
+    def __init__(self, path=DEFAULT_STORE_PATH, timeout=BUSY_TIMEOUT):
+        """A SQLite database of Record objects, indexed so clients and plans can be looked up without
+        parsing their documents again
+
+        The database is in WAL mode, so it can be read while it is written to, and several processes
+        can write to it at once, each waiting for the others' transactions to finish
+
+        Args:
+            path(str): The path of the database file, which is created if it doesn't exist (optional)
+            timeout(float): How many seconds to wait for another process's write to finish (optional)
+
+        """
+        self.path = path
+
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, timeout=timeout)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+
+        # Durable once each checkpoint completes, which is much faster than syncing every commit
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+
+        try:
+            self.upgrade()
+        except Exception:
+            self.connection.close()
+            raise
+
+    def get_version(self):
+        """Gets the schema version of the store
+
+        Returns:
+            int: The version, or 0 if the store is new
+
+        """
+        return self.connection.execute('PRAGMA user_version').fetchone()[0]
+
+    def upgrade(self):
+        """Creates the tables of a new store
+
+        Raises:
+            ValueError: If the store was made by a newer version, whose schema isn't known
+
+        Returns:
+            None
+
+        """
+        if self.get_version() == SCHEMA_VERSION:
+            return
+
+        with self.connection:
+            # Lock the database first, so other processes opening it wait until it is created
+            self.connection.execute('BEGIN IMMEDIATE')
+            version = self.get_version()
+            if version == SCHEMA_VERSION:
+                return
+
+            if version > SCHEMA_VERSION:
+                raise ValueError(
+                    f'{self.path} was made by a newer version of the store (schema version {version}, '
+                    f'this version supports {SCHEMA_VERSION})'
+                )
+
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+
+            self.connection.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def get_row(self, record, source=''):
+        """Gets the values of the columns of a Record object
+
+        Args:
+            record(Record): A Record object
+            source(str): The path of the document the Record object was built from (optional)
+
+        Returns:
+            tuple: The values, in the order of INSERT_SQL
+
+        """
+        # Leave out unknown values, so they are never matched against each other
+        ndis_number = None if record.client.ndis_number == TBC else record.client.ndis_number
+        start_date = parse_date(record.plan.start_date)
+        return (
+            ndis_number,
+            None if record.client.first_name == TBC else record.client.first_name,
+            None if record.client.last_name == TBC else record.client.last_name,
+            start_date,
+            parse_date(record.plan.end_date),
+            source,
+            get_plan_key(ndis_number, start_date, source),
+            datetime.datetime.now().isoformat(timespec='seconds'),
+            dumps_json(record)
+        )
+
+    def put(self, record, source=''):
+        """Adds a Record object to the store, replacing an earlier import of the same plan
+
+        Args:
+            record(Record): A Record object
+            source(str): The path of the document the Record object was built from (optional)
+
+        Returns:
+            None
+
+        """
+        self.put_many([(record, source)])
+
+    def put_many(self, records):
+        """Adds many Record objects to the store in a single transaction
+
+        Args:
+            records(iterable((Record, str))): Each Record object and the path of the document it was
+                built from, or ''
+
+        Returns:
+            int: The number of Record objects added
+
+        """
+        rows = [self.get_row(record, source) for record, source in records]
+        with self.connection:
+            self.connection.executemany(INSERT_SQL, rows)
+
+        return len(rows)
+
+    def query(self, where='', parameters=()):
+        """Gets the Record objects in rows matching a condition
+
+        Args:
+            where(str): The SQL condition, or '' for every row (optional)
+            parameters(tuple): The values of the condition's parameters (optional)
+
+        Returns:
+            list(Record): The Record objects, ordered by plan end date
+
+        """
+        sql = 'SELECT data FROM records'
+        if where:
+            sql += f' WHERE {where}'
+
+        sql += ' ORDER BY end_date, last_name'
+        return [loads_json(data) for data, in self.connection.execute(sql, parameters)]
+
+    def find_by_ndis_number(self, ndis_number):
+        """Finds every plan of a client
+
+        Args:
+            ndis_number(str): The client's NDIS number
+
+        Returns:
+            list(Record): The Record objects of the client's plans
+
+        """
+        return self.query('ndis_number = ?', (ndis_number,))
+
+    def find_by_last_name(self, last_name):
+        """Finds every plan of the clients with a last name, ignoring case
+
+        Args:
+            last_name(str): The last name
+
+        Returns:
+            list(Record): The Record objects of the clients' plans
+
+        """
+        return self.query('last_name = ? COLLATE NOCASE', (last_name,))
+
+    def find_starting(self, start, end):
+        """Finds the plans that start within a date range
+
+        Args:
+            start(datetime.date): The first date of the range
+            end(datetime.date): The last date of the range
+
+        Returns:
+            list(Record): The Record objects of the plans
+
+        """
+        return self.query('start_date BETWEEN ? AND ?', (start.isoformat(), end.isoformat()))
+
+    def find_due_for_review(self, start=None, end=None):
+        """Finds the plans that end, and so are due for review, within a date range
+
+        Args:
+            start(datetime.date): The first date of the range, or None for the start of next month
+                (optional)
+            end(datetime.date): The last date of the range, or None for the end of next month (optional)
+
+        Returns:
+            list(Record): The Record objects of the plans
+
+        """
+        next_month = get_next_month()
+        start = start or next_month[0]
+        end = end or next_month[1]
+
+        return self.query('end_date BETWEEN ? AND ?', (start.isoformat(), end.isoformat()))
+
+    def count(self):
+        """Counts the plans in the store
+
+        Returns:
+            int: The number of plans
+
+        """
+        return self.connection.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+    def close(self):
+        """Closes the database
+
+        Returns:
+            None
+
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main(argv=None):
+    """Adds documents to a store or lists the plans due for review
+
+    Args:
+        argv(list(str)): The command line arguments (optional)
+
+    Returns:
+        int: The exit code
+
+    """
+    parser = argparse.ArgumentParser(description='Store parsed NDIS plans and look them up.')
+    parser.add_argument('-s', '--store', default=DEFAULT_STORE_PATH,
+                        help='the database file (default: %(default)s)')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    add_parser = commands.add_parser('add', help='parse a folder of documents and add them to the store')
+    add_parser.add_argument('folder', help='the folder of word documents to add')
+    add_parser.add_argument('-r', '--recursive', action='store_true', help='also add documents in subfolders')
+
+    due_parser = commands.add_parser('due', help='list the plans due for review, next month by default')
+    due_parser.add_argument('--from', dest='start', type=datetime.date.fromisoformat,
+                            help='the first date to list plans ending on, as yyyy-mm-dd')
+    due_parser.add_argument('--to', dest='end', type=datetime.date.fromisoformat,
+                            help='the last date to list plans ending on, as yyyy-mm-dd')
+    args = parser.parse_args(argv)
+
+    with RecordStore(args.store) as store:
+        if args.command == 'add':
+            from batch import batch_parse, find_documents
+
+            records = []
+            failures = 0
+            for path, record, error in batch_parse(find_documents(args.folder, args.recursive)):
+                if error is not None:
+                    failures += 1
+                    print(f'FAILED {path}: {error}', file=sys.stderr)
+                else:
+                    records.append((record, os.path.abspath(path)))
+
+            print(f'Added {store.put_many(records)} plans, {store.count()} in the store')
+            return 1 if failures else 0
+
+        for record in store.find_due_for_review(args.start, args.end):
+            print(f'{record.plan.end_date}  {record.client.ndis_number}  {record.client.full_name}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,25 @@
+import random
+
+import export
+from batch import main
+from corpus import generate_plan, write_plan
+from store import RecordStore
+
+
+def test_export_error_is_a_failure(tmp_path, monkeypatch, capsys):
+    folder = tmp_path / 'plans'
+    folder.mkdir()
+    for i in range(3):
+        write_plan(str(folder / f'plan-{i}.docx'), generate_plan(i, random.Random(i)))
+
+    def record_export(record, export_folder):
+        if record.client.ndis_number.endswith('1'):
+            raise OSError('disk full')
+
+    monkeypatch.setattr(export, 'record_export', record_export)
+    store_path = str(tmp_path / 'records.db')
+
+    assert main([str(folder), '-w', '1', '-o', str(tmp_path / 'out'), '-s', store_path]) == 1
+    assert 'FAILED' in capsys.readouterr().err
+    with RecordStore(store_path) as store:
+        assert store.count() == 2
@@ -0,0 +1,41 @@
+import os
+import random
+
+from cache import RecordCache
+from memory import build_slotted, generate_fields
+from serialize import dumps_binary
+
+
+def build_record(i):
+    return build_slotted(generate_fields(i, random.Random(i)))
+
+
+def test_put_and_get(tmp_path):
+    cache = RecordCache(str(tmp_path))
+    record = build_record(0)
+    key = cache.get_key(b'document')
+
+    assert cache.get(key) is None
+
+    cache.put(key, record)
+    assert str(cache.get(key)) == str(record)
+    assert cache.get_key(b'document') == key
+    assert cache.get_key(b'another document') != key
+
+
+def test_evict(tmp_path):
+    entry_size = len(dumps_binary(build_record(0)))
+    cache = RecordCache(str(tmp_path), max_size=entry_size * 3)
+    keys = [cache.get_key(str(i).encode()) for i in range(5)]
+    for i, key in enumerate(keys[:3]):
+        cache.put(key, build_record(0))
+
+        # Make the order the entries were used in clear, however coarse the file system's mtimes are
+        os.utime(cache.get_path(key), (i, i))
+
+    cache.get(keys[0])
+    for key in keys[3:]:
+        cache.put(key, build_record(0))
+
+    assert cache.size <= cache.max_size
+    assert [os.path.exists(cache.get_path(key)) for key in keys] == [True, False, False, True, True]
@@ -0,0 +1,97 @@
+import os
+import random
+import zipfile
+
+import docx
+import pytest
+
+from export import (
+    DOCUMENT_XML_PATH, NDIS_NUMBER_COLUMN, RawWordTemplate, WordTemplate, excel_export_batch, get_resources,
+    get_template, merge_excel_rows, upsert_excel_rows, word_export
+)
+from openpyxl import Workbook, load_workbook
+from parse import TBC
+from memory import build_slotted, generate_fields
+
+
+@pytest.mark.parametrize('i', range(3))
+def test_raw_word_export(tmp_path, i):
+    record = build_records(i + 1)[i]
+    folder = tmp_path / 'docx'
+    raw_folder = tmp_path / 'raw'
+    folder.mkdir()
+    raw_folder.mkdir()
+
+    word_export(record, str(folder))
+    word_export(record, str(raw_folder), raw_xml=True)
+
+    filenames = sorted(os.listdir(folder))
+    assert filenames and filenames == sorted(os.listdir(raw_folder))
+    for filename in filenames:
+        with zipfile.ZipFile(folder / filename) as archive, \
+                zipfile.ZipFile(raw_folder / filename) as raw_archive:
+            assert raw_archive.testzip() is None
+            assert sorted(raw_archive.namelist()) == sorted(archive.namelist())
+            assert raw_archive.read(DOCUMENT_XML_PATH) == archive.read(DOCUMENT_XML_PATH)
+
+        # The copied parts and the appended xml must still make a document python-docx can open
+        docx.Document(str(raw_folder / filename))
+
+
+def test_get_template_by_class():
+    src = get_resources('docx')[0]
+    template = get_template(src, WordTemplate)
+    raw_template = get_template(src, RawWordTemplate)
+
+    assert type(raw_template) is RawWordTemplate
+    assert get_template(src, WordTemplate) is template
+    assert get_template(src, RawWordTemplate) is raw_template
+
+
+def build_records(count):
+    return [build_slotted(generate_fields(i, random.Random(i))) for i in range(count)]
+
+
+def count_rows(path):
+    wb = load_workbook(path, read_only=True)
+    try:
+        return sum(1 for _ in wb.active.iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+
+@pytest.mark.parametrize('upsert', (False, True))
+def test_excel_export_batch_generator(tmp_path, upsert):
+    records = build_records(3)
+    template_rows = count_rows(get_resources('xlsx')[0])
+
+    paths = excel_export_batch((record for record in records), str(tmp_path), upsert=upsert)
+
+    assert len(paths) == len(get_resources('xlsx'))
+    for path in paths:
+        assert count_rows(path) == template_rows + len(records)
+
+
+def get_row(ndis_number, name):
+    return (name,) + ('',) * (NDIS_NUMBER_COLUMN - 2) + (ndis_number,)
+
+
+def test_merge_excel_rows():
+    rows = [('Title',), get_row('430000001', 'a'), get_row(430000002, 'b')]
+
+    merge_excel_rows(rows, [get_row('430000002', 'c'), get_row(TBC, 'd'), get_row('430000003', 'e'),
+                            get_row(TBC, 'f'), get_row('430000003', 'g')])
+
+    # Numbers stored as numbers match the same number as text, and unknown numbers are always added
+    assert [row[0] for row in rows] == ['Title', 'a', 'c', 'd', 'g', 'f']
+
+
+def test_upsert_excel_rows():
+    wb = Workbook()
+    ws = wb.active
+    for row in (('Title',), get_row('430000001', 'a'), get_row('430000002', 'b')):
+        ws.append(row)
+
+    upsert_excel_rows(ws, [get_row('430000001', 'c'), get_row('430000003', 'd'), get_row('430000003', 'e')])
+
+    assert [row[0] for row in ws.iter_rows(values_only=True)] == ['Title', 'c', 'b', 'e']
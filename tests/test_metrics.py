@@ -0,0 +1,40 @@
+import metrics
+import parse
+import tracing
+
+
+def test_metrics_and_tracing_stack():
+    original = parse.build_record_from_text
+    try:
+        metrics.enable(exporters=False)
+        tracing.enable(exporters=False)
+        assert metrics.is_enabled() and tracing.is_enabled()
+
+        # Switching metrics off leaves the functions traced
+        metrics.disable()
+        assert not metrics.is_enabled() and tracing.is_enabled()
+        assert parse.build_record_from_text is not original
+
+        metrics.metrics.reset()
+        tracing.tracer.take()
+        parse.get_title('Mr Test Name\n')
+        assert not metrics.metrics.snapshot()
+        assert [event['name'] for event in tracing.tracer.take()] == ['get_title']
+    finally:
+        metrics.disable()
+        tracing.disable()
+
+    assert parse.build_record_from_text is original
+
+
+def test_prometheus_summary():
+    recorded = metrics.Metrics()
+    recorded.record('get_title', 0.5)
+    recorded.record('get_title', 1.5, tbc=True)
+
+    lines = recorded.to_prometheus().splitlines()
+    assert '# TYPE ndis_parser_seconds summary' in lines
+    assert 'ndis_parser_seconds{function="get_title",quantile="0.95"} 1.5' in lines
+    assert 'ndis_parser_seconds_sum{function="get_title"} 2.0' in lines
+    assert 'ndis_parser_seconds_count{function="get_title"} 2' in lines
+    assert 'ndis_parser_tbc_total{function="get_title"} 1' in lines
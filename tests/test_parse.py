@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from corpus import SECTIONS, generate_plan, write_plan
+from parse import TBC, build_record_from_document
+
+PLANS = 5
+
+# A summary of the plan's funding under the same headings as its supports sections, which comes
+# before the sections in some plans
+FUNDING_SUMMARY = (
+    'Funding summary',
+    'Core supports',
+    '$1,000.00',
+    'Capacity building supports',
+    '$2,000.00',
+    'Capital supports',
+    '$3,000.00',
+    'Total funded supports',
+    '$6,000.00'
+)
+CLIENT_DETAILS_LINES = 12
+
+
+def get_expected_supports(lines):
+    """Gets the goals, budgets and total of each supports section a generated plan was written with
+
+    Args:
+        lines(list(str)): The paragraphs of the plan
+
+    Returns:
+        dict(str, (tuple(str), set((str, str)), str)): The goals, the (category, budget) pairs and the
+            total of each section, by the section's name in Records
+
+    """
+    expected = {}
+    for name, heading, _, funding in SECTIONS:
+        goals_start = lines.index(f'Goal/s my {name} supports will help me pursue:') + 1
+        funding_start = lines.index(funding, goals_start)
+        total_start = lines.index(f'Total {name} supports', funding_start)
+
+        # The core supports list their flexible budget before their categories
+        budgets = lines[funding_start + 1:total_start]
+        if name == 'core':
+            pairs = {('Core', budgets[0])} | set(zip(budgets[1::2], budgets[2::2]))
+        else:
+            pairs = set(zip(budgets[::2], budgets[1::2]))
+
+        expected[heading.title()] = (tuple(lines[goals_start:funding_start]), pairs, lines[total_start + 1])
+
+    return expected
+
+
+def build_record(tmp_path, i, summary=False):
+    """Generates a plan, writes it and builds a Record object from it
+
+    Args:
+        tmp_path(pathlib.Path): The folder to write the plan to
+        i(int): The index of the plan
+        summary(bool): Whether to add a funding summary after the client details (optional)
+
+    Returns:
+        (Record, list(str)): The built Record object and the paragraphs of the plan
+
+    """
+    lines = generate_plan(i, random.Random(i))
+    if summary:
+        lines[CLIENT_DETAILS_LINES:CLIENT_DETAILS_LINES] = FUNDING_SUMMARY
+
+    path = str(tmp_path / f'plan-{i}.docx')
+    write_plan(path, lines)
+    return build_record_from_document(path), lines
+
+
+@pytest.mark.parametrize('i', range(PLANS))
+def test_corpus_plan(tmp_path, i):
+    record, lines = build_record(tmp_path, i)
+
+    assert record.client.ndis_number == f'43{i:07}'
+    assert f'Name: {record.client.full_name}' in lines
+    assert record.plan.start_date != TBC
+    assert record.plan.end_date != TBC
+    assert record.funded_supports_total == lines[lines.index('Total funded supports') + 1]
+
+    for section, (goals, pairs, total) in get_expected_supports(lines).items():
+        supports = record.supports[section]
+        assert supports.goals == goals
+        assert supports.total == total
+        assert pairs <= set(supports.categories)
+
+
+@pytest.mark.parametrize('i', range(PLANS))
+def test_funding_summary(tmp_path, i):
+    record, _ = build_record(tmp_path, i)
+    summary_record, _ = build_record(tmp_path, i, summary=True)
+
+    for section, supports in record.supports.items():
+        summary_supports = summary_record.supports[section]
+        assert summary_supports.goals == supports.goals
+        assert summary_supports.categories == supports.categories
+        assert summary_supports.total == supports.total
+
+
+def test_missing_categories(tmp_path):
+    lines = generate_plan(0, random.Random(0))
+    for category in ('Assistive Technology', 'Home Modifications and Specialist Disability Accommodation'):
+        if category in lines:
+            i = lines.index(category)
+            del lines[i:i + 2]
+
+    path = str(tmp_path / 'plan.docx')
+    write_plan(path, lines)
+
+    # A section without any categories has no budgets to report, which is never an empty tuple
+    assert build_record_from_document(path).supports['Capital'].categories == TBC
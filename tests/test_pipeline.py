@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from pipeline import Stage, run_pipeline
+
+FAILURE_TIME = 0.5
+
+
+def work(path):
+    if path.startswith('bad'):
+        time.sleep(FAILURE_TIME)
+        raise ValueError('failed')
+
+    time.sleep(0.01)
+    return path
+
+
+def test_busy_time_counts_successes():
+    with ThreadPoolExecutor(max_workers=1) as threads:
+        stage = Stage('work', work, threads, 1)
+        failures = asyncio.run(run_pipeline(['bad0', 'good0', 'bad1'], [stage]))
+
+    assert [path for path, _ in failures] == ['bad0', 'bad1']
+    assert stage.items == 1
+
+    # Even one failure would take longer than the success
+    assert 0.01 <= stage.busy_time < FAILURE_TIME
@@ -0,0 +1,103 @@
+import random
+
+import numpy as np
+import pytest
+
+from corpus import generate_plan
+from parse import TBC, build_record_from_text
+from portfolio import CATEGORIES, SECTIONS, Portfolio, format_cents, parse_cents
+
+PLANS = 4
+
+
+def to_cents(amount):
+    # Converted separately from parse_cents, so the sums are checked against an independent count
+    dollars, cents = amount.lstrip('$').replace(',', '').split('.')
+    return int(dollars) * 100 + int(cents)
+
+
+def build_record(i, dates=True):
+    lines = generate_plan(i, random.Random(i))
+    if not dates:
+        lines = [
+            'Plan dates to be confirmed' if line.startswith('Plan start date:') else line for line in lines
+        ]
+
+    return build_record_from_text('\n'.join(lines))
+
+
+@pytest.fixture(scope='module')
+def records():
+    return [build_record(i) for i in range(PLANS)] + [build_record(PLANS, dates=False)]
+
+
+@pytest.mark.parametrize('amount, cents', (
+    ('$12,345.67', 1234567),
+    ('$1,000', 100000),
+    ('1000.50', 100050),
+    (' $0.05 ', 5),
+    (TBC, None),
+    (None, None),
+    ('', None),
+    ('$1,00.00', None),
+    ('$12.3', None),
+    ('twelve dollars', None)
+))
+def test_parse_cents(amount, cents):
+    assert parse_cents(amount) == cents
+
+
+@pytest.mark.parametrize('cents, amount', ((1234567, '$12,345.67'), (5, '$0.05'), (0, '$0.00'),
+                                            (-123456, '-$1,234.56'), (-5, '-$0.05')))
+def test_format_cents(cents, amount):
+    assert format_cents(cents) == amount
+
+
+def test_sums_match_records(records):
+    assert records[-1].plan.start_date == TBC and records[-1].plan.end_date == TBC
+    portfolio = Portfolio.from_records(records)
+
+    assert len(portfolio) == len(records)
+    assert portfolio.get_funded_total() == sum(to_cents(record.funded_supports_total) for record in records)
+    assert portfolio.get_section_totals() == {
+        section: sum(to_cents(record.supports[section].total) for record in records) for section in SECTIONS
+    }
+
+    totals = {}
+    counts = {}
+    for record in records:
+        budgets = {}
+        for supports in record.supports.values():
+            for category, budget in supports.categories:
+                budgets[category] = budgets.get(category, 0) + to_cents(budget)
+
+        for category, cents in budgets.items():
+            totals[category] = totals.get(category, 0) + cents
+            counts[category] = counts.get(category, 0) + 1
+
+    assert set(totals) <= set(CATEGORIES)
+    assert portfolio.get_category_totals() == totals
+    assert portfolio.get_category_counts() == counts
+
+
+def test_filters_leave_out_missing_dates(records):
+    portfolio = Portfolio.from_records(records)
+    dated = [record for record in records if record.plan.start_date != TBC]
+
+    # Unbounded filters still leave out the plan without dates
+    assert len(portfolio.filter_dates()) == len(dated)
+    assert len(portfolio.filter_dates(column='end_date')) == len(dated)
+
+    first = dated[0]
+    assert list(portfolio.filter_dates(first.plan.start_date, first.plan.start_date).ndis_numbers) == [
+        record.client.ndis_number for record in dated if record.plan.start_date == first.plan.start_date
+    ]
+
+    # Every dated plan is running on its own start date, and the plan without dates never is
+    for record in dated:
+        active = portfolio.filter_active(record.plan.start_date, record.plan.start_date)
+        assert record.client.ndis_number in active.ndis_numbers
+        assert records[-1].client.ndis_number not in active.ndis_numbers
+
+    everything = portfolio.filter_active(np.datetime64('1900-01-01'), np.datetime64('2999-12-31'))
+    assert len(everything) == len(dated)
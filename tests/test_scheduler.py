@@ -0,0 +1,28 @@
+import pytest
+
+import tracing
+from scheduler import run_export_job
+
+
+def fail(record):
+    with tracing.tracer.span('failed job'):
+        raise ValueError('failed')
+
+
+def succeed(record):
+    with tracing.tracer.span('next job'):
+        pass
+
+
+def test_failed_job_events_are_cleared():
+    tracing.tracer.take()
+    try:
+        with pytest.raises(ValueError):
+            run_export_job(fail, None, (), traced=True)
+
+        events, snapshot = run_export_job(succeed, None, (), traced=True)
+    finally:
+        tracing.disable()
+
+    assert [event['name'] for event in events] == ['next job']
+    assert snapshot is None
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from corpus import generate_plan, write_plan
+from parse import build_record_from_document
+from serialize import dumps_binary, dumps_json, loads_binary, loads_json, record_to_dict
+
+
+@pytest.fixture(scope='module')
+def records(tmp_path_factory):
+    folder = tmp_path_factory.mktemp('plans')
+    records = []
+    for i in range(3):
+        path = str(folder / f'plan-{i}.docx')
+        write_plan(path, generate_plan(i, random.Random(i)))
+        records.append(build_record_from_document(path))
+
+    return records
+
+
+@pytest.mark.parametrize('dumps, loads', ((dumps_json, loads_json), (dumps_binary, loads_binary)))
+def test_round_trip(records, dumps, loads):
+    for record in records:
+        loaded = loads(dumps(record))
+
+        assert record_to_dict(loaded) == record_to_dict(record)
+        assert str(loaded) == str(record)
+
+        # The parser produces tuples, so the loaded Record object must too
+        for supports in loaded.supports.values():
+            assert isinstance(supports.goals, tuple)
+            assert isinstance(supports.categories, tuple)
+
+
+def test_loads_binary_rejects_other_data(records):
+    data = dumps_binary(records[0])
+
+    with pytest.raises(ValueError):
+        loads_binary(b'not a record')
+
+    with pytest.raises(ValueError):
+        loads_binary(data[:len(data) // 2])
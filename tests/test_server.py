@@ -0,0 +1,10 @@
+from server import get_content_disposition
+
+
+def test_content_disposition():
+    header = get_content_disposition('Nguyễn, "Zoë" \\.zip')
+
+    # Header values are encoded as latin-1, and the quoted name must not end early
+    header.encode('latin-1')
+    assert header.startswith('attachment; filename="Nguy_n, _Zo__ _.zip"; ')
+    assert header.endswith("filename*=UTF-8''Nguy%E1%BB%85n%2C%20%22Zo%C3%AB%22%20%5C.zip")
@@ -0,0 +1,63 @@
+import datetime
+import random
+import sqlite3
+
+import pytest
+
+from memory import build_slotted, generate_fields
+from parse import TBC
+from store import SCHEMA_VERSION, RecordStore
+
+
+def build_record(i, **fields):
+    values = generate_fields(i, random.Random(i))
+    values.update(fields)
+    return build_slotted(values)
+
+
+def test_put_and_query(tmp_path):
+    records = [build_record(i) for i in range(5)]
+    with RecordStore(str(tmp_path / 'records.db')) as store:
+        store.put_many((record, f'/plans/{i}.docx') for i, record in enumerate(records))
+
+        assert store.count() == 5
+        assert [r.client.full_name for r in store.find_by_ndis_number(records[2].client.ndis_number)] \
+            == [records[2].client.full_name]
+        assert [r.client.ndis_number for r in store.find_by_last_name(records[3].client.last_name.upper())] \
+            == [records[3].client.ndis_number]
+
+        end_date = datetime.datetime.strptime(records[0].plan.end_date, '%d/%m/%Y').date()
+        due = store.find_due_for_review(end_date, end_date)
+        assert due and all(r.plan.end_date == records[0].plan.end_date for r in due)
+
+
+def test_put_replaces_plan(tmp_path):
+    with RecordStore(str(tmp_path / 'records.db')) as store:
+        store.put(build_record(0), '/plans/a.docx')
+        store.put(build_record(0, full_name='Renamed Surname0'), '/plans/b.docx')
+
+        assert store.count() == 1
+        assert store.query()[0].client.full_name == 'Renamed Surname0'
+
+
+def test_put_replaces_unknown_plan_by_source(tmp_path):
+    with RecordStore(str(tmp_path / 'records.db')) as store:
+        for _ in range(2):
+            store.put(build_record(0, ndis_number=TBC), '/plans/a.docx')
+            store.put(build_record(1, start_date=TBC), '/plans/b.docx')
+
+        # Without a document to tell them apart, plans missing a value are always added
+        store.put(build_record(2, ndis_number=TBC))
+        store.put(build_record(2, ndis_number=TBC))
+
+        assert store.count() == 4
+
+
+def test_newer_version(tmp_path):
+    path = str(tmp_path / 'records.db')
+    connection = sqlite3.connect(path)
+    connection.execute(f'PRAGMA user_version={SCHEMA_VERSION + 1}')
+    connection.close()
+
+    with pytest.raises(ValueError, match='newer version'):
+        RecordStore(path)
@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+
+import watch
+from watch import Manifest, Watcher
+
+
+class RecordingWatcher(Watcher):
+    """A Watcher that records the documents it processes instead of exporting them"""
+
+    def __init__(self, *args, fail=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail = set(fail)
+        self.processed = []
+
+    def process(self, path, data):
+        self.processed.append(os.path.basename(path))
+        if os.path.basename(path) in self.fail:
+            raise ValueError('unreadable')
+
+
+def write(path, data, mtime):
+    with open(path, 'wb') as file:
+        file.write(data)
+
+    os.utime(path, (mtime, mtime))
+
+
+def poll(watcher):
+    # Documents are only processed once they have looked the same on two polls
+    watcher.poll()
+    return watcher.poll()
+
+
+@pytest.fixture
+def folders(tmp_path):
+    folder = tmp_path / 'plans'
+    folder.mkdir()
+    write(folder / 'a.docx', b'a', 1)
+    write(folder / 'b.docx', b'b', 1)
+
+    return str(folder), str(tmp_path / 'exports')
+
+
+def test_touch_retries_failed_document(folders):
+    folder, export_folder = folders
+    watcher = RecordingWatcher(folder, export_folder, settle_time=0, fail={'b.docx'})
+
+    assert poll(watcher) == 2
+    assert Manifest(watcher.manifest.path).entries['b.docx']['error'] == 'ValueError: unreadable'
+
+    # Touching a document that was exported doesn't export it again, but touching one that failed
+    # tries it again, keeping its error while it still fails
+    write(os.path.join(folder, 'a.docx'), b'a', 2)
+    write(os.path.join(folder, 'b.docx'), b'b', 2)
+    watcher.processed.clear()
+
+    assert poll(watcher) == 1
+    assert watcher.processed == ['b.docx']
+    assert Manifest(watcher.manifest.path).entries['b.docx']['error'] == 'ValueError: unreadable'
+
+
+def test_manifest_saved_while_polling(folders, monkeypatch):
+    folder, export_folder = folders
+    for i in range(5):
+        write(os.path.join(folder, f'c{i}.docx'), b'c', 1)
+
+    monkeypatch.setattr(watch, 'MANIFEST_SAVE_DOCUMENTS', 3)
+    watcher = RecordingWatcher(folder, export_folder, settle_time=0)
+    watcher.poll()
+
+    saves = []
+    save = watcher.manifest.save
+    watcher.manifest.save = lambda: saves.append(len(watcher.manifest.entries)) or save()
+
+    def interrupt(path, data):
+        if path.endswith('c3.docx'):
+            raise KeyboardInterrupt
+
+    # The documents recorded before the last save aren't processed again after an interruption
+    watcher.process = interrupt
+    with pytest.raises(KeyboardInterrupt):
+        watcher.poll()
+
+    assert saves == [3]
+    with open(watcher.manifest.path, encoding='utf-8') as file:
+        assert sorted(json.load(file)['documents']) == ['a.docx', 'b.docx', 'c0.docx']
+
+    # Saved every few documents and once at the end, instead of after every document
+    saves.clear()
+    watcher.process = lambda path, data: None
+    watcher.poll()
+    watcher.poll()
+    assert saves == [6, 7]
+
+
+def test_once_fails_when_a_document_fails(folders):
+    folder, export_folder = folders
+    write(os.path.join(folder, 'a.docx'), b'not a word document', 1)
+
+    assert watch.main([folder, export_folder, '--once']) == 1
+
+    # Only failures during the run count, and the failed document isn't tried again until it changes
+    assert watch.main([folder, export_folder, '--once']) == 0
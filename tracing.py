@@ -0,0 +1,255 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+from patching import is_wrapped, unwrap_functions, wrap_function
+
+# The tag the traced functions are wrapped with
+PATCH_TAG = 'tracing'
+
+# The offset from perf_counter to the epoch, so the timestamps of different processes line up
+CLOCK_OFFSET = time.time() - time.perf_counter()
+
+PARSE_FUNCTIONS = (
+    'stream_document', 'clean_document', 'build_record_from_document', 'build_record_from_bytes',
+    'build_record_from_text'
+)
+EXPORT_FUNCTIONS = (
+    'word_export', 'word_export_template', 'excel_export', 'excel_export_batch', 'record_export',
+    'get_template'
+)
+
+
+def get_timestamp():
+    """Gets the current time the way trace events record it
+
+    Returns:
+        float: The microseconds since the epoch
+
+    """
+    return (time.perf_counter() + CLOCK_OFFSET) * 1000000
+
+
+class Tracer:
+    def __init__(self):
+        """The spans recorded in this process, as Chrome trace events"""
+        self.events = []
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+
+    def add(self, name, category, start, end, args=None):
+        """Records one finished span
+
+        Args:
+            name(str): The name of the span
+            category(str): The category of the span, such as parse or export
+            start(float): When the span started, from get_timestamp
+            end(float): When the span ended, from get_timestamp
+            args(dict): Extra details to show with the span (optional)
+
+        Returns:
+            None
+
+        """
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start,
+            'dur': end - start,
+            'pid': os.getpid(),
+            'tid': threading.get_ident()
+        }
+        if args:
+            event['args'] = args
+
+        with self.lock:
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def span(self, name, category='', **args):
+        """Records the time spent in a block of code as a span
+
+        Args:
+            name(str): The name of the span
+            category(str): The category of the span (optional)
+            **args: Extra details to show with the span
+
+        """
+        start = get_timestamp()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, get_timestamp(), args)
+
+    def merge(self, events):
+        """Adds the events recorded by another process, such as a worker process
+
+        Args:
+            events(list(dict)): The events
+
+        Returns:
+            None
+
+        """
+        with self.lock:
+            self.events.extend(events)
+
+    def take(self):
+        """Takes the recorded events and forgets them, so each call only sees new events
+
+        Returns:
+            list(dict): The events
+
+        """
+        with self.lock:
+            events = self.events
+            self.events = []
+
+        return events
+
+    def to_json(self):
+        """Formats the recorded events as a Chrome trace, which chrome://tracing and Perfetto can open
+
+        Returns:
+            str: The JSON trace
+
+        """
+        with self.lock:
+            events = list(self.events)
+
+        # Name each process and thread, so the worker processes can be told apart from this one
+        names = []
+        pids = set()
+        for pid, tid in sorted({(event['pid'], event['tid']) for event in events}):
+            if pid not in pids:
+                pids.add(pid)
+                process_name = 'main' if pid == self.pid else f'worker {pid}'
+                names.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': process_name}})
+
+            names.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': str(tid)}
+            })
+
+        return json.dumps({'traceEvents': names + events, 'displayTimeUnit': 'ms'})
+
+
+# The spans recorded in this process
+tracer = Tracer()
+
+
+def trace(function, name, category):
+    """Wraps a function so each call of it is recorded as a span
+
+    Args:
+        function(function): The function to wrap
+        name(str): The name to record the function's spans under
+        category(str): The category to record the function's spans under
+
+    Returns:
+        function: The wrapped function
+
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = get_timestamp()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            tracer.add(name, category, start, get_timestamp())
+
+    return wrapper
+
+
+def replace(owner, name, category, label=None):
+    """Replaces a function of a module or class with a traced one
+
+    Args:
+        owner(object): The module or class the function belongs to
+        name(str): The name of the function
+        category(str): The category to record the function's spans under
+        label(str): The name to record the function's spans under, or None to use its name (optional)
+
+    Returns:
+        None
+
+    """
+    wrap_function(owner, name, PATCH_TAG, functools.partial(trace, name=label or name, category=category))
+
+
+def enable(exporters=True):
+    """Traces the stages of parsing and, optionally, exporting a document, which can be done alongside
+    metrics
+
+    Nothing is traced until this is called, so there is no overhead while it is switched off
+
+    Args:
+        exporters(bool): Whether to trace the exporters too, which imports export (optional)
+
+    Returns:
+        None
+
+    """
+    import parse
+
+    try:
+        import docx2txt
+
+        replace(docx2txt, 'process', 'parse', 'docx2txt.process')
+    except ImportError:
+        pass
+
+    for name in [name for name in vars(parse) if name.startswith('get_')] + list(PARSE_FUNCTIONS):
+        replace(parse, name, 'parse')
+
+    replace(parse.Location, '__init__', 'parse', 'Location')
+
+    if exporters:
+        import docx.document
+        import export
+        import openpyxl
+
+        for name in EXPORT_FUNCTIONS:
+            replace(export, name, 'export')
+
+        replace(export.WordTemplate, 'render', 'export', 'WordTemplate.render')
+        replace(export.RawWordTemplate, 'render', 'export', 'RawWordTemplate.render')
+        replace(docx.document.Document, 'save', 'export', 'Document.save')
+        replace(openpyxl.Workbook, 'save', 'export', 'Workbook.save')
+
+
+def disable():
+    """Restores the original functions, switching tracing off
+
+    Returns:
+        None
+
+    """
+    unwrap_functions(PATCH_TAG)
+
+
+def is_enabled():
+    """Checks whether tracing is switched on
+
+    Returns:
+        bool: True if the functions are traced, False otherwise
+
+    """
+    return is_wrapped(PATCH_TAG)
+
+
+def write_trace(path):
+    """Writes the recorded spans to a Chrome trace file
+
+    Args:
+        path(str): The path of the file
+
+    Returns:
+        None
+
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(tracer.to_json())
@@ -0,0 +1,339 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from batch import find_documents
+from cache import write_file_atomic
+from parse import PARSER_VERSION, build_record_from_bytes
+
+MANIFEST_FILENAME = '.ndis-manifest.json'
+MANIFEST_VERSION = 1
+DEFAULT_INTERVAL = 2.0
+DEFAULT_SETTLE_TIME = 1.0
+
+# How often the manifest is saved while a poll works through documents, so a restart after a crash
+# only processes the documents since the last save again, without rewriting it after every document
+MANIFEST_SAVE_INTERVAL = 1.0
+MANIFEST_SAVE_DOCUMENTS = 50
+
+
+class Manifest:
+    def __init__(self, path):
+        """The documents that have already been processed, stored in a file so they aren't processed
+        again after a restart
+
+        Args:
+            path(str): The path of the manifest file, which is created if it doesn't exist
+
+        """
+        self.path = path
+
+        # The size, mtime, sha256 hash and error message (or None) of each document, by path
+        self.entries = {}
+
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f'Ignoring unreadable manifest {path}: {e}', file=sys.stderr)
+            return
+
+        # Documents processed by another version of the parser would be extracted differently now
+        if data.get('version') == MANIFEST_VERSION and data.get('parser_version') == PARSER_VERSION:
+            self.entries = data['documents']
+
+    def is_unchanged(self, path, stat):
+        """Checks whether a document has the same size and mtime as when it was processed
+
+        Args:
+            path(str): The path of the document
+            stat(os.stat_result): The current status of the document
+
+        Returns:
+            bool: True if the document looks unchanged, False otherwise
+
+        """
+        entry = self.entries.get(path)
+        return entry is not None and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns
+
+    def is_exported(self, path, digest):
+        """Checks whether a document was already exported with the same contents
+
+        Args:
+            path(str): The path of the document
+            digest(str): The sha256 hash of the document's current contents
+
+        Returns:
+            bool: True if the document was processed with these contents without an error, False
+                otherwise
+
+        """
+        entry = self.entries.get(path)
+        return entry is not None and entry['hash'] == digest and entry['error'] is None
+
+    def update(self, path, stat, digest, error=None):
+        """Records that a document was processed
+
+        Args:
+            path(str): The path of the document
+            stat(os.stat_result): The status of the document when it was read
+            digest(str): The sha256 hash of the document
+            error(str): The error message if the document failed, so it isn't retried until it
+                is modified (optional)
+
+        Returns:
+            None
+
+        """
+        self.entries[path] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': digest,
+            'error': error
+        }
+
+    def remove_missing(self, paths):
+        """Forgets the documents that are no longer in the folder
+
+        Args:
+            paths(set(str)): The paths of the documents that are still in the folder
+
+        Returns:
+            bool: True if any documents were forgotten, False otherwise
+
+        """
+        missing = [path for path in self.entries if path not in paths]
+        for path in missing:
+            del self.entries[path]
+
+        return bool(missing)
+
+    def save(self):
+        """Writes the manifest to its file
+
+        Returns:
+            None
+
+        """
+        data = {
+            'version': MANIFEST_VERSION,
+            'parser_version': PARSER_VERSION,
+            'documents': self.entries
+        }
+
+        write_file_atomic(self.path, json.dumps(data, indent=1, sort_keys=True).encode('utf-8'))
+
+
+class Watcher:
+    def __init__(self, folder, export_folder, manifest_path='', recursive=False,
+                 settle_time=DEFAULT_SETTLE_TIME, raw_xml=False):
+        """Processes the new and changed word documents in a folder
+
+        Args:
+            folder(str): The folder to watch
+            export_folder(str): The absolute path of the folder to export to
+            manifest_path(str): The path of the manifest file, or '' to keep it in the watched folder
+                (optional)
+            recursive(bool): Whether to also watch the folder's subfolders (optional)
+            settle_time(float): How many seconds a document must go unmodified before it is
+                processed, so documents that are still being copied in are skipped (optional)
+            raw_xml(bool): Whether to render the word documents' xml directly instead of through
+                python-docx (optional)
+
+        """
+        self.folder = folder
+        self.export_folder = export_folder
+        self.recursive = recursive
+        self.settle_time = settle_time
+        self.raw_xml = raw_xml
+        self.manifest = Manifest(manifest_path or os.path.join(folder, MANIFEST_FILENAME))
+
+        # The size and mtime each changed document had on the last poll, by path
+        self.pending = {}
+
+        # The number of documents that failed on the last poll
+        self.failures = 0
+
+        os.makedirs(export_folder, exist_ok=True)
+
+        # Import the exporters and load the templates now, so the first document isn't slowed down
+        from export import RawWordTemplate, Template, WordTemplate, get_resources, get_template
+
+        for src in get_resources('docx'):
+            get_template(src, RawWordTemplate if raw_xml else WordTemplate)
+
+        for src in get_resources('xlsx'):
+            get_template(src, Template)
+
+    def process(self, path, data):
+        """Parses a document and exports it
+
+        Args:
+            path(str): The path of the document
+            data(bytes): The contents of the document
+
+        Returns:
+            None
+
+        """
+        from export import export_all
+
+        export_all(build_record_from_bytes(data), self.export_folder, self.raw_xml)
+
+    def poll(self):
+        """Checks the folder once, processing every document that changed and has settled
+
+        Returns:
+            int: The number of documents processed. The number that failed, including any that
+                couldn't be read, is kept in failures
+
+        """
+        processed = 0
+        self.failures = 0
+        now = time.time()
+        paths = set()
+
+        # The documents recorded in the manifest since it was last saved, and when that was
+        unsaved = 0
+        last_save = time.monotonic()
+        for path in find_documents(self.folder, self.recursive):
+            key = os.path.relpath(path, self.folder)
+            paths.add(key)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            if self.manifest.is_unchanged(key, stat):
+                self.pending.pop(key, None)
+                continue
+
+            # Wait until the document stops changing between polls and hasn't been modified lately
+            size_and_mtime = (stat.st_size, stat.st_mtime_ns)
+            if self.pending.get(key) != size_and_mtime or now - stat.st_mtime < self.settle_time:
+                self.pending[key] = size_and_mtime
+                continue
+
+            del self.pending[key]
+            try:
+                with open(path, 'rb') as file:
+                    data = file.read()
+            except OSError as e:
+                self.failures += 1
+                print(f'FAILED {path}: {type(e).__name__}: {e}', file=sys.stderr)
+                continue
+
+            digest = hashlib.sha256(data).hexdigest()
+            if self.manifest.is_exported(key, digest):
+                # Only the mtime changed, so there is nothing to export again. A document that
+                # failed is tried again instead, so touching it retries it
+                self.manifest.update(key, stat, digest)
+            else:
+                error = None
+                try:
+                    self.process(path, data)
+                    print(path)
+                except Exception as e:
+                    self.failures += 1
+                    error = f'{type(e).__name__}: {e}'
+                    print(f'FAILED {path}: {error}', file=sys.stderr)
+
+                self.manifest.update(key, stat, digest, error)
+                processed += 1
+
+            unsaved += 1
+            if unsaved >= MANIFEST_SAVE_DOCUMENTS or time.monotonic() - last_save >= MANIFEST_SAVE_INTERVAL:
+                self.manifest.save()
+                unsaved = 0
+                last_save = time.monotonic()
+
+        for key in list(self.pending):
+            if key not in paths:
+                del self.pending[key]
+
+        if self.manifest.remove_missing(paths) or unsaved:
+            self.manifest.save()
+
+        return processed
+
+    def run(self, interval=DEFAULT_INTERVAL):
+        """Polls the folder until interrupted
+
+        Args:
+            interval(float): The number of seconds between polls (optional)
+
+        Returns:
+            None
+
+        """
+        while True:
+            self.poll()
+            time.sleep(interval)
+
+
+def main(argv=None):
+    """Watches a folder and exports every new or changed document in it
+
+    Args:
+        argv(list(str)): The command line arguments (optional)
+
+    Returns:
+        int: The exit code
+
+    """
+    parser = argparse.ArgumentParser(description='Watch a folder of NDIS plans and export new ones.')
+    parser.add_argument('folder', help='the folder to watch for word documents')
+    parser.add_argument('output_folder', help='the folder to export the output documents to')
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help='also watch subfolders')
+    parser.add_argument('-m', '--manifest', default='',
+                        help=f'the manifest file of processed documents (default: {MANIFEST_FILENAME} in the folder)')
+    parser.add_argument('-i', '--interval', type=float, default=DEFAULT_INTERVAL,
+                        help='the number of seconds between checks (default: %(default)s)')
+    parser.add_argument('-s', '--settle-time', type=float, default=DEFAULT_SETTLE_TIME,
+                        help='how many seconds a document must be unmodified before it is processed '
+                             '(default: %(default)s)')
+    parser.add_argument('--once', action='store_true',
+                        help='check the folder once and exit instead of watching it')
+    parser.add_argument('--raw-xml', action='store_true',
+                        help='render the word documents without python-docx, which is faster')
+    args = parser.parse_args(argv)
+
+    watcher = Watcher(
+        args.folder,
+        os.path.abspath(args.output_folder),
+        args.manifest,
+        args.recursive,
+        0 if args.once else args.settle_time,
+        args.raw_xml
+    )
+
+    if args.once:
+        # There is no earlier poll to compare with, so treat every document as having settled
+        for path in find_documents(args.folder, args.recursive):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            watcher.pending[os.path.relpath(path, args.folder)] = (stat.st_size, stat.st_mtime_ns)
+
+        print(f'Processed: {watcher.poll()}')
+        return 1 if watcher.failures else 0
+
+    print(f'Watching {args.folder}')
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())